@@ -0,0 +1,75 @@
+"""
+Times history charts over a year of per-minute data (525,600 points per coin).
+
+Run from the project root:
+    python -m benchmarks.bench_history_plot --coins 5
+    python -m benchmarks.bench_history_plot --coins 5 --naive   # also plot every point
+"""
+import os
+import argparse
+import tempfile
+import time
+import numpy as np
+import matplotlib
+matplotlib.use('Agg')
+import matplotlib.pyplot as plt
+
+import src.visualizer as vis
+
+MINUTES_PER_YEAR = 365 * 24 * 60
+
+
+def synthetic_history(n_coins, n_points, seed=0):
+    """Random-walk price series in the layout returned by history.load_history."""
+    rng = np.random.default_rng(seed)
+    start = np.datetime64('2025-01-01T00:00:00', 's')
+    log_returns = rng.normal(0, 0.001, (n_coins, n_points))
+    prices = np.exp(np.cumsum(log_returns, axis=1)) * np.exp(rng.normal(3, 3, (n_coins, 1)))
+    return {
+        'time': start + np.arange(n_points).astype('timedelta64[m]'),
+        'coins': [f"Coin {i}" for i in range(n_coins)],
+        'price_usd': prices,
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--coins', type=int, default=5)
+    parser.add_argument('--points', type=int, default=MINUTES_PER_YEAR)
+    parser.add_argument('--naive', action='store_true', help="Also time plotting every raw point.")
+    args = parser.parse_args()
+
+    history = synthetic_history(args.coins, args.points)
+    x = history['time'].astype(np.float64)
+    y = history['price_usd']
+    print(f"\n{args.coins} coins x {args.points} points\n")
+
+    with tempfile.TemporaryDirectory() as workdir:
+        os.chdir(workdir)
+
+        for method, func, n_out in (('lttb', vis.lttb_downsample, 1200), ('minmax', vis.minmax_downsample, 600)):
+            start = time.perf_counter()
+            func(x, y, n_out)
+            downsample = time.perf_counter() - start
+
+            start = time.perf_counter()
+            filepath = vis.generate_history_plot(history, method=method)
+            total = time.perf_counter() - start
+            print(f"  {method:<7} downsample {downsample * 1000:8.1f} ms | full chart {total * 1000:8.1f} ms "
+                  f"| {os.path.getsize(filepath) / 1024:7.1f} KB")
+
+        if args.naive:
+            start = time.perf_counter()
+            plt.figure(figsize=(12, 6), dpi=100)
+            for row in y:
+                plt.plot(history['time'], 100 * (row / row[0] - 1), linewidth=1)
+            plt.savefig('naive.png')
+            plt.close()
+            print(f"  naive   (every point)           full chart {(time.perf_counter() - start) * 1000:8.1f} ms "
+                  f"| {os.path.getsize('naive.png') / 1024:7.1f} KB")
+
+        os.chdir(os.path.dirname(workdir))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,96 @@
+"""
+Per-worker memory and startup cost of handing a snapshot to N worker processes:
+pickling the TickerTable into every task vs. attaching to one shared memory segment.
+
+Run from the project root (Linux, reads /proc/self/smaps_rollup):
+    python -m benchmarks.bench_shared_snapshot --coins 200000 --workers 1 2 4 8
+"""
+import os
+import time
+import argparse
+import multiprocessing
+import numpy as np
+from concurrent.futures import ProcessPoolExecutor
+
+import src.shared_snapshot as ss
+from src.ticker_table import TickerTable, NUMERIC_COLUMNS, TEXT_COLUMNS
+
+# Keeps each task busy long enough that every worker receives exactly one
+_HOLD_SECONDS = 0.3
+
+
+def _private_mb():
+    """Private (unshared) resident memory of this process, in MB."""
+    total_kb = 0
+    with open('/proc/self/smaps_rollup') as f:
+        for line in f:
+            if line.startswith(('Private_Clean:', 'Private_Dirty:')):
+                total_kb += int(line.split()[1])
+    return total_kb / 1024
+
+
+def _warm_up(_):
+    """Starts a worker and records its baseline memory."""
+    time.sleep(_HOLD_SECONDS)
+    return os.getpid(), _private_mb()
+
+
+def _task(mode, payload, submitted_at):
+    # In pickle mode the payload was already unpickled before this line runs,
+    # so the growth is measured against the warm-up baseline of the same pid.
+    table = payload if mode == 'pickle' else ss.attached_table(payload)
+    table.values.sum()  # Read every numeric value (no temporary copy, unlike nansum)
+    ready = time.time() - submitted_at
+    memory = _private_mb()
+    time.sleep(_HOLD_SECONDS)
+    return os.getpid(), memory, ready
+
+
+def synthetic_table(n_coins, seed=0):
+    rng = np.random.default_rng(seed)
+    values = rng.normal(size=(len(NUMERIC_COLUMNS), n_coins))
+    text = {}
+    for col in TEXT_COLUMNS:
+        column = np.empty(n_coins, dtype=object)
+        column[:] = [f"{col}-{i}" for i in range(n_coins)]
+        text[col] = column
+    return TickerTable(values, text, [str(i) for i in range(n_coins)])
+
+
+def run(mode, table, workers):
+    # Spawned workers start clean, so fork copy-on-write pages do not blur the numbers
+    with ProcessPoolExecutor(max_workers=workers, mp_context=multiprocessing.get_context('spawn')) as pool:
+        baseline = dict(pool.map(_warm_up, range(workers)))  # Start every worker before timing
+
+        shared = ss.SharedSnapshot(table) if mode == 'shared' else None
+        payload = table if mode == 'pickle' else shared.descriptor
+        start = time.time()
+        futures = [pool.submit(_task, mode, payload, start) for _ in range(workers)]
+        results = [f.result() for f in futures]
+        if shared:
+            shared.close()
+
+    grown = [memory - baseline[pid] for pid, memory, _ in results]
+    ready = [r[2] for r in results]
+    return np.mean(grown), max(ready)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--coins', type=int, default=200_000)
+    parser.add_argument('--workers', type=int, nargs='+', default=[1, 2, 4, 8])
+    args = parser.parse_args()
+
+    ss.start_tracker()
+    table = synthetic_table(args.coins)
+    print(f"\nSnapshot: {args.coins} coins ({table.values.nbytes / 2**20:.1f} MB numeric)\n")
+    print(f"  {'mode':<8} {'workers':>7} {'private MB/worker':>18} {'all workers ready ms':>21}")
+
+    for mode in ('pickle', 'shared'):
+        for workers in args.workers:
+            grown, ready = run(mode, table, workers)
+            print(f"  {mode:<8} {workers:>7} {grown:>18.1f} {ready * 1000:>21.1f}")
+
+
+if __name__ == "__main__":
+    main()
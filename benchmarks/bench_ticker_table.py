@@ -0,0 +1,83 @@
+"""
+Compares the DataFrame path against the array-backed TickerTable path.
+
+Run from the project root:
+    python -m benchmarks.bench_ticker_table --coins 5000
+"""
+import os
+import argparse
+import tempfile
+import time
+import numpy as np
+
+import src.data_cleaning as dc
+import src.analysis_models as am
+from src.data_ingestion import REPORTS_DIR
+from src.ticker_table import TickerTable, load_ticker_table
+from benchmarks.synthetic import write_synthetic_export
+
+
+def timed(label, func, repeat=3):
+    """Runs func `repeat` times and prints the best wall time. Returns the last result."""
+    best = float('inf')
+    result = None
+    for _ in range(repeat):
+        start = time.perf_counter()
+        result = func()
+        best = min(best, time.perf_counter() - start)
+    print(f"  {label:<38} {best * 1000:10.2f} ms")
+    return result, best
+
+
+def analyse_snapshot(data, coin_names):
+    """Runs every per-coin model over the whole snapshot plus the best growth model."""
+    for name in coin_names:
+        am.min_squares_prediction(data, name)
+        am.weighted_average_change(data, name)
+        am.calculate_volatility(data, name)
+    am.get_best_growth_coin(data)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--coins', type=int, default=5000, help="Coins in the synthetic snapshot.")
+    parser.add_argument('--lookups', type=int, default=1000, help="Random per-coin lookups to time.")
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as workdir:
+        os.chdir(workdir)
+        filename = 'consulta_tickers_benchmark.txt'
+        write_synthetic_export(REPORTS_DIR, filename, args.coins)
+
+        print(f"\nSnapshot: {args.coins} coins, {args.lookups} lookups\n")
+
+        print("Load")
+        df, t_df_load = timed("load_data_from_csv (DataFrame)", lambda: dc.load_data_from_csv(filename))
+        table, t_tab_load = timed("load_ticker_table (TickerTable)", lambda: load_ticker_table(filename))
+        timed("TickerTable.from_dataframe", lambda: TickerTable.from_dataframe(df))
+
+        rng = np.random.default_rng(1)
+        names = df['name'].to_numpy()[rng.integers(0, len(df), args.lookups)]
+
+        print("\nPer-coin lookup (1h/24h/7d changes)")
+        _, t_df_lookup = timed("boolean mask + values.flatten()", lambda: [
+            df[df['name'] == n][['percent_change_1h', 'percent_change_24h', 'percent_change_7d']].values.flatten()
+            for n in names])
+        _, t_tab_lookup = timed("TickerTable.coin_changes", lambda: [table.coin_changes(n) for n in names])
+
+        # The DataFrame path is slow enough that a single run is representative
+        coin_names = df['name'].tolist()
+        print("\nFull-snapshot analysis (3 per-coin models + best growth)")
+        _, t_df_full = timed("DataFrame", lambda: analyse_snapshot(df, coin_names), repeat=1)
+        _, t_tab_full = timed("TickerTable", lambda: analyse_snapshot(table, coin_names), repeat=1)
+
+        print("\nSpeed-up (DataFrame / TickerTable)")
+        print(f"  load:      {t_df_load / t_tab_load:8.1f}x")
+        print(f"  lookup:    {t_df_lookup / t_tab_lookup:8.1f}x")
+        print(f"  analysis:  {t_df_full / t_tab_full:8.1f}x")
+
+        os.chdir(os.path.dirname(workdir))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,114 @@
+"""
+Load test for the local analytics service (src/analytics_service.py).
+
+Start the service first, then run from the project root:
+    python -m benchmarks.load_test_service --requests 5000 --concurrency 32
+
+Each client keeps one HTTP/1.1 connection open and sends requests back to back.
+Latency is measured per request and reported as p50/p99 per route.
+"""
+import json
+import time
+import asyncio
+import argparse
+from urllib.parse import quote
+import numpy as np
+
+from src.analytics_service import DEFAULT_HOST, DEFAULT_PORT
+
+
+async def _request(reader, writer, host, path):
+    """Sends one GET on an open connection. Returns (status, body size)."""
+    writer.write(f"GET {path} HTTP/1.1\r\nHost: {host}\r\n\r\n".encode('latin-1'))
+    await writer.drain()
+
+    status = int((await reader.readline()).split()[1])
+    length = 0
+    while True:
+        line = await reader.readline()
+        if line in (b'\r\n', b''):
+            break
+        key, _, value = line.decode('latin-1').partition(':')
+        if key.lower() == 'content-length':
+            length = int(value)
+    await reader.readexactly(length)
+    return status, length
+
+
+async def _client(host, port, paths, latencies, errors):
+    reader, writer = await asyncio.open_connection(host, port)
+    try:
+        for path in paths:
+            start = time.perf_counter()
+            status, _ = await _request(reader, writer, host, path)
+            latencies[path].append(time.perf_counter() - start)
+            if status != 200:
+                errors[path] = errors.get(path, 0) + 1
+    finally:
+        writer.close()
+
+
+async def run_load_test(host, port, total_requests, concurrency, include_charts):
+    # Discover coin names so the per-coin routes hit real entries
+    reader, writer = await asyncio.open_connection(host, port)
+    writer.write(f"GET /coins HTTP/1.1\r\nHost: {host}\r\nConnection: close\r\n\r\n".encode())
+    raw = await reader.read()
+    writer.close()
+    coins = json.loads(raw.split(b'\r\n\r\n', 1)[1])[:50]
+
+    routes = ['/snapshot', '/best-growth'] + [f"/coins/{quote(c)}" for c in coins]
+    routes += [f"/coins/{quote(c)}/regression" for c in coins[:5]]
+    if include_charts:
+        routes += ['/charts/bar?column=percent_change_24h', f"/charts/projection?coin={quote(coins[0])}"]
+
+    rng = np.random.default_rng(0)
+    picks = [routes[i] for i in rng.integers(0, len(routes), total_requests)]
+    shards = [picks[i::concurrency] for i in range(concurrency)]
+
+    latencies = {route: [] for route in routes}
+    errors = {}
+    start = time.perf_counter()
+    await asyncio.gather(*(_client(host, port, shard, latencies, errors) for shard in shards))
+    elapsed = time.perf_counter() - start
+
+    return latencies, errors, elapsed
+
+
+def _route_group(route):
+    """Collapses per-coin routes into one line of the report."""
+    path = route.split('?')[0]
+    if path.startswith('/coins/'):
+        return '/coins/<name>/regression' if path.endswith('/regression') else '/coins/<name>'
+    return path
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--host', default=DEFAULT_HOST)
+    parser.add_argument('--port', type=int, default=DEFAULT_PORT)
+    parser.add_argument('--requests', type=int, default=5000)
+    parser.add_argument('--concurrency', type=int, default=32)
+    parser.add_argument('--no-charts', action='store_true', help="Skip the PNG routes.")
+    args = parser.parse_args()
+
+    latencies, errors, elapsed = asyncio.run(
+        run_load_test(args.host, args.port, args.requests, args.concurrency, not args.no_charts))
+
+    groups = {}
+    for route, values in latencies.items():
+        groups.setdefault(_route_group(route), []).extend(values)
+    everything = [v for values in groups.values() for v in values]
+
+    print(f"\n{len(everything)} requests in {elapsed:.2f} s "
+          f"({len(everything) / elapsed:.0f} req/s, concurrency {args.concurrency})\n")
+    print(f"  {'route':<28} {'count':>7} {'p50 ms':>9} {'p99 ms':>9}")
+    for group, values in sorted(groups.items()) + [('ALL', everything)]:
+        if values:
+            p50, p99 = np.percentile(np.array(values) * 1000, [50, 99])
+            print(f"  {group:<28} {len(values):>7} {p50:>9.2f} {p99:>9.2f}")
+    if errors:
+        print(f"\nNon-200 responses: {errors}")
+
+
+if __name__ == "__main__":
+    main()
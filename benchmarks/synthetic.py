@@ -0,0 +1,55 @@
+import os
+import csv
+import numpy as np
+
+from src.data_ingestion import TICKERS_FIELDNAMES
+
+
+def synthetic_tickers(n_coins, seed=0):
+    """
+    Builds a list of ticker dicts shaped like the CoinLore API response.
+
+    Args:
+        n_coins (int): Number of coins in the snapshot.
+        seed (int): Seed for the random generator, so runs are reproducible.
+
+    Returns:
+        list: One dict per coin, keyed by TICKERS_FIELDNAMES.
+    """
+    rng = np.random.default_rng(seed)
+    price = np.exp(rng.normal(0, 3, n_coins))
+    supply = np.exp(rng.normal(18, 2, n_coins))
+    volume = price * supply * rng.uniform(0.001, 0.2, n_coins)
+
+    tickers = []
+    for i in range(n_coins):
+        tickers.append({
+            'id': 1000 + i,
+            'symbol': f"C{i}",
+            'name': f"Coin {i}",
+            'nameid': f"coin-{i}",
+            'rank': i + 1,
+            'price_usd': f"{price[i]:.6f}",
+            'percent_change_24h': f"{rng.normal(0, 4):.2f}",
+            'percent_change_1h': f"{rng.normal(0, 1):.2f}",
+            'percent_change_7d': f"{rng.normal(0, 10):.2f}",
+            'price_btc': f"{price[i] / 100000:.8f}",
+            'market_cap_usd': f"{price[i] * supply[i]:.2f}",
+            'volume24': f"{volume[i]:.2f}",
+            'volume24a': f"{volume[i] * rng.uniform(0.8, 1.2):.2f}",
+            'csupply': f"{supply[i]:.2f}",
+            'tsupply': f"{supply[i] * 1.1:.2f}",
+            'msupply': '' if i % 3 else f"{supply[i] * 2:.0f}",
+        })
+    return tickers
+
+
+def write_synthetic_export(directory, filename, n_coins, seed=0):
+    """Writes a synthetic raw export with the same layout as save_data_to_csv. Returns its path."""
+    os.makedirs(directory, exist_ok=True)
+    filepath = os.path.join(directory, filename)
+    with open(filepath, 'w', newline='') as csvfile:
+        writer = csv.DictWriter(csvfile, fieldnames=TICKERS_FIELDNAMES)
+        writer.writeheader()
+        writer.writerows(synthetic_tickers(n_coins, seed))
+    return filepath
@@ -0,0 +1,325 @@
+import os
+import json
+import time
+import argparse
+import numpy as np
+
+from src.data_ingestion import REPORTS_DIR, ensure_directory_exists, previous_snapshot_path
+from src.ticker_table import read_ticker_table, NUMERIC_COLUMNS
+
+# Shipped next to this module, so the rules are found from any working directory
+ALERT_RULES_FILE = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'alert_rules.json')
+ALERTS_DIR = 'reports/alerts'
+ALERTS_OUTPUT_FILE = os.path.join(ALERTS_DIR, 'alerts.jsonl')
+ALERT_STATE_FILE = os.path.join(ALERTS_DIR, 'alert_state.json')
+
+DEFAULT_COOLDOWN = 3600  # Seconds before the same rule can fire again for the same coin
+
+OPERATORS = {'<': np.less, '<=': np.less_equal, '>': np.greater,
+             '>=': np.greater_equal, '==': np.equal, '!=': np.not_equal}
+
+# How a column is turned into the series a rule compares against its threshold
+TRANSFORMS = ('value', 'delta', 'ratio', 'pct_change')
+
+# Rules x coins cells evaluated at once; bounds memory for very large rule sets
+_EVAL_BLOCK = 4_000_000
+
+
+def load_rules(path=ALERT_RULES_FILE):
+    """
+    Loads the alert rules file: a JSON list of rule objects.
+
+    Each rule has:
+        name (str): Unique rule name.
+        column (str): Snapshot column, e.g. 'percent_change_1h' or 'volume24'.
+        op (str): One of <, <=, >, >=, ==, !=.
+        threshold (float): Value the series is compared against.
+        transform (str, optional): 'value' (default), or a comparison with the previous
+            snapshot: 'delta' (current - previous), 'ratio' (current / previous),
+            'pct_change' (100 * (current / previous - 1)).
+        max_rank (int, optional): Only coins ranked 1..max_rank.
+        coins (list, optional): Only these coin names.
+        cooldown (float, optional): Seconds before re-firing for the same coin.
+
+    Example:
+        [{"name": "top50_1h_drop", "column": "percent_change_1h", "op": "<", "threshold": -3, "max_rank": 50},
+         {"name": "volume_doubles", "column": "volume24", "transform": "ratio", "op": ">=", "threshold": 2}]
+
+    Returns:
+        list: The rule dicts, or an empty list if the file does not exist.
+    """
+    if not os.path.exists(path):
+        return []
+    with open(path, 'r') as f:
+        rules = json.load(f)
+    if not isinstance(rules, list):
+        raise ValueError(f"{path} must contain a JSON list of rules.")
+    return rules
+
+
+def _is_number(value):
+    return isinstance(value, (int, float)) and not isinstance(value, bool)
+
+
+def _validate_rule(rule, names):
+    """Raises ValueError if a rule is malformed, so one bad rule never crashes a fetch."""
+    if not isinstance(rule, dict):
+        raise ValueError(f"Every rule must be a JSON object (got {rule!r}).")
+    name = rule.get('name')
+    if not isinstance(name, str) or not name or name in names:
+        raise ValueError(f"Every rule needs a unique 'name' (got {name!r}).")
+    if 'column' not in rule or 'threshold' not in rule:
+        raise ValueError(f"Rule '{name}' needs a 'column' and a 'threshold'.")
+    if not isinstance(rule['column'], str) or rule['column'] not in NUMERIC_COLUMNS:
+        raise ValueError(f"Rule '{name}': column must be one of {', '.join(NUMERIC_COLUMNS)}.")
+    if not isinstance(rule.get('op'), str) or rule['op'] not in OPERATORS:
+        raise ValueError(f"Rule '{name}': op must be one of {', '.join(OPERATORS)}.")
+    transform = rule.get('transform', 'value')
+    if not isinstance(transform, str) or transform not in TRANSFORMS:
+        raise ValueError(f"Rule '{name}': transform must be one of {', '.join(TRANSFORMS)}.")
+    for key in ('threshold', 'max_rank', 'cooldown'):
+        if key in rule and not _is_number(rule[key]):
+            raise ValueError(f"Rule '{name}': {key} must be a number (got {rule[key]!r}).")
+    coins = rule.get('coins')
+    if coins is not None and not (isinstance(coins, list) and all(isinstance(c, str) for c in coins)):
+        raise ValueError(f"Rule '{name}': coins must be a list of coin names.")
+
+
+def _rule_cooldown(rule):
+    return float(rule.get('cooldown', DEFAULT_COOLDOWN))
+
+
+class CompiledRules:
+    """
+    A rule set compiled for vectorized evaluation.
+
+    Rules sharing (column, transform, op) are grouped and their thresholds and rank
+    limits stored as arrays, so each group is evaluated against every coin with a
+    single broadcast comparison instead of one pass per rule.
+    """
+
+    def __init__(self, rules):
+        self.rules = []
+        names = set()
+        grouped = {}
+
+        for rule in rules:
+            _validate_rule(rule, names)
+            name = rule['name']
+            transform = rule.get('transform', 'value')
+
+            names.add(name)
+            index = len(self.rules)
+            self.rules.append(rule)
+            grouped.setdefault((rule['column'], transform, rule['op']), []).append(index)
+
+        self.groups = []
+        for (column, transform, op), indices in grouped.items():
+            self.groups.append({
+                'column': column,
+                'transform': transform,
+                'op': op,
+                'rules': np.array(indices),
+                'thresholds': np.array([float(self.rules[i]['threshold']) for i in indices]),
+                'max_rank': np.array([float(self.rules[i].get('max_rank', np.inf)) for i in indices]),
+            })
+
+        # Rules restricted to a coin list are filtered after the vectorized pass
+        self.coin_filters = {i: set(rule['coins']) for i, rule in enumerate(self.rules) if rule.get('coins')}
+
+    @property
+    def needs_previous(self):
+        return any(group['transform'] != 'value' for group in self.groups)
+
+
+def _series(table, previous, prev_rows, column, transform):
+    """Builds the per-coin series a group of rules compares against."""
+    current = table[column]
+    if transform == 'value':
+        return current
+
+    before = np.full(len(table), np.nan)
+    if previous is not None:
+        found = prev_rows >= 0
+        before[found] = previous[column][prev_rows[found]]
+
+    with np.errstate(divide='ignore', invalid='ignore'):
+        if transform == 'delta':
+            return current - before
+        if transform == 'ratio':
+            return current / before
+        return 100 * (current / before - 1)
+
+
+def evaluate_rules(compiled, table, previous=None):
+    """
+    Evaluates every rule against a snapshot in one pass per rule group.
+
+    Args:
+        compiled (CompiledRules): The compiled rule set.
+        table (TickerTable): The new snapshot.
+        previous (TickerTable): The snapshot before it, needed by non-'value' transforms.
+
+    Returns:
+        list: (rule index, row, series value) for every match.
+    """
+    prev_rows = table.align_to(previous) if previous is not None else np.full(len(table), -1)
+    rank = table['rank']
+    series_cache = {}
+    matches = []
+
+    for group in compiled.groups:
+        key = (group['column'], group['transform'])
+        if key not in series_cache:
+            series_cache[key] = _series(table, previous, prev_rows, *key)
+        series = series_cache[key]
+        finite = np.isfinite(series)
+        compare = OPERATORS[group['op']]
+
+        # Broadcast (rules, 1) against (1, coins); NaN series values never fire
+        block = max(1, _EVAL_BLOCK // max(1, len(series)))
+        for start in range(0, len(group['rules']), block):
+            thresholds = group['thresholds'][start:start + block, None]
+            max_rank = group['max_rank'][start:start + block, None]
+            in_rank = (rank[None, :] <= max_rank) | np.isinf(max_rank)
+            hits = compare(series[None, :], thresholds) & finite[None, :] & in_rank
+
+            for rule_pos, row in zip(*np.nonzero(hits)):
+                matches.append((int(group['rules'][start + rule_pos]), int(row), float(series[row])))
+
+    results = []
+    names = table['name']
+    for rule_index, row, value in matches:
+        coins = compiled.coin_filters.get(rule_index)
+        if coins is not None and names[row] not in coins:
+            continue
+        results.append((rule_index, row, value))
+    return results
+
+
+def _load_state(path):
+    if not os.path.exists(path):
+        return {}
+    try:
+        with open(path, 'r') as f:
+            state = json.load(f)
+    except json.JSONDecodeError:
+        return {}
+    if not isinstance(state, dict):
+        return {}
+    return {key: fired for key, fired in state.items() if _is_number(fired)}
+
+
+def apply_cooldown(compiled, table, matches, snapshot_name, state_path=ALERT_STATE_FILE, now=None):
+    """
+    Turns raw matches into alert records, dropping duplicates and alerts still in cooldown.
+
+    The last firing time of each (rule, coin) pair is persisted in state_path so the
+    cooldown also holds across runs.
+
+    Returns:
+        list: The alert dicts that should be emitted.
+    """
+    now = time.time() if now is None else now
+    state = _load_state(state_path)
+    alerts = []
+    seen = set()
+
+    for rule_index, row, value in matches:
+        rule = compiled.rules[rule_index]
+        key = f"{rule['name']}|{table.ids[row]}"
+        if key in seen:
+            continue
+        seen.add(key)
+
+        if now - state.get(key, float('-inf')) < _rule_cooldown(rule):
+            continue
+        state[key] = now
+
+        alerts.append({
+            'rule': rule['name'],
+            'coin_id': table.ids[row],
+            'coin': table['name'][row],
+            'symbol': table['symbol'][row],
+            'rank': int(table['rank'][row]) if np.isfinite(table['rank'][row]) else None,
+            'column': rule['column'],
+            'transform': rule.get('transform', 'value'),
+            'value': round(value, 6),
+            'condition': f"{rule['op']} {rule['threshold']}",
+            'snapshot': snapshot_name,
+            'fired_at': time.strftime("%Y-%m-%d %H:%M:%S", time.localtime(now)),
+        })
+
+    # Entries older than the longest cooldown can no longer silence anything: drop
+    # them so the state stays proportional to the recently fired (rule, coin) pairs
+    longest = max((_rule_cooldown(rule) for rule in compiled.rules), default=DEFAULT_COOLDOWN)
+    state = {key: fired for key, fired in state.items() if now - fired < longest}
+
+    ensure_directory_exists(os.path.dirname(state_path))
+    with open(state_path, 'w') as f:
+        json.dump(state, f)
+
+    return alerts
+
+
+def write_alerts(alerts, sink='file', output_path=ALERTS_OUTPUT_FILE):
+    """Writes fired alerts to a JSON Lines file ('file') or to the console ('stdout')."""
+    if sink == 'stdout':
+        for alert in alerts:
+            print(f"[ALERT] {alert['rule']}: {alert['coin']} ({alert['symbol']}) "
+                  f"{alert['column']} {alert['transform']} = {alert['value']} {alert['condition']}")
+        return
+
+    ensure_directory_exists(os.path.dirname(output_path))
+    with open(output_path, 'a') as f:
+        for alert in alerts:
+            f.write(json.dumps(alert) + '\n')
+
+
+def evaluate_snapshot_alerts(filepath, rules_path=ALERT_RULES_FILE, sink='file'):
+    """
+    Evaluates the alert rules against a freshly saved snapshot and emits what fires.
+
+    Args:
+        filepath (str): Path of the raw export that just landed.
+        rules_path (str): The alert rules file. Nothing happens if it does not exist.
+        sink (str): 'file' or 'stdout'.
+
+    Returns:
+        list: The alerts that fired.
+    """
+    rules = load_rules(rules_path)
+    if not rules:
+        return []
+
+    compiled = CompiledRules(rules)
+    table = read_ticker_table(filepath)
+
+    previous = None
+    if compiled.needs_previous:
+        previous_path = previous_snapshot_path(filepath)
+        if previous_path:
+            previous = read_ticker_table(previous_path)
+
+    matches = evaluate_rules(compiled, table, previous)
+    alerts = apply_cooldown(compiled, table, matches, os.path.basename(filepath))
+    write_alerts(alerts, sink=sink)
+    return alerts
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Evaluate the alert rules against a raw tickers export.")
+    parser.add_argument('snapshot', nargs='?', default=None, help="Raw export file name (default: newest).")
+    parser.add_argument('--rules', default=ALERT_RULES_FILE)
+    parser.add_argument('--sink', choices=['file', 'stdout'], default='stdout')
+    args = parser.parse_args()
+
+    snapshot = args.snapshot
+    if snapshot is None:
+        files = sorted(f for f in os.listdir(REPORTS_DIR) if f.endswith('.txt'))
+        snapshot = files[-1] if files else None
+    if snapshot is None:
+        print("No Tickers files found.")
+    else:
+        fired = evaluate_snapshot_alerts(os.path.join(REPORTS_DIR, snapshot), args.rules, args.sink)
+        print(f"{len(fired)} alerts fired for {snapshot}.")
@@ -4,6 +4,98 @@ import pandas as pd
 from sklearn.linear_model import LinearRegression
 from sklearn.metrics import r2_score
 
+from src.ticker_table import TickerTable, CHANGE_COLUMNS
+
+# Weights applied to the 1h, 24h and 7d changes (more weight on recent changes)
+CHANGE_WEIGHTS = np.array([0.5, 0.333333, 0.1666666])
+
+# Abscissas (X) of the 1h, 24h and 7d changes in the Least Squares trend
+TREND_X = np.array((0, 6.85, 7))
+
+
+def _coin_row(df, coin_name):
+    """
+    Returns the row position of a coin (first match) in a DataFrame or a TickerTable,
+    or None if the coin is not present. The models look the row up once and read
+    every value they need from it.
+    """
+    if isinstance(df, TickerTable):
+        return df.row_of(coin_name)
+
+    matches = np.flatnonzero(df['name'].to_numpy() == coin_name)
+    return int(matches[0]) if len(matches) else None
+
+
+def _row_value(df, row, column):
+    """Returns a single column value at a row of a DataFrame or a TickerTable."""
+    if isinstance(df, TickerTable):
+        return df[column][row]
+    return df[column].iat[row]
+
+
+def _row_changes(df, row):
+    """Returns the 1h, 24h and 7d changes at a row as a flat array."""
+    if isinstance(df, TickerTable):
+        return df.values[:3, row]
+    return np.array([df[col].iat[row] for col in CHANGE_COLUMNS], dtype=np.float64)
+
+
+def _row_feature(df, row, feature):
+    """
+    Returns a materialized feature at a row (see src.feature_store), or None if the
+    snapshot was loaded without it, so the caller computes the value itself.
+    """
+    if feature not in df:
+        return None
+    return float(_row_value(df, row, feature))
+
+
+def _coin_value(df, coin_name, column):
+    """Returns a single column value of a coin from a DataFrame or a TickerTable."""
+    return _row_value(df, _coin_row(df, coin_name), column)
+
+
+def _change_matrix(df):
+    """The 1h, 24h and 7d changes of every coin as a (3, n_coins) array."""
+    if isinstance(df, TickerTable):
+        return df.changes
+    return df[CHANGE_COLUMNS].to_numpy(dtype=np.float64).T
+
+
+def trend_slopes(df):
+    """
+    Computes the Least Squares trend slope of every coin in one vectorized step
+    (same formula as min_squares_prediction).
+
+    Args:
+        df (pd.DataFrame | TickerTable): The cleaned snapshot.
+
+    Returns:
+        np.ndarray: One slope per coin, in row order.
+    """
+    l = _change_matrix(df)
+    x = TREND_X
+
+    s_x = np.sum(x)
+    s_l = np.sum(l, axis=0)
+    s_xy = np.sum(x[:, np.newaxis] * l, axis=0)
+    s_x_sqr = np.sum(x ** 2)
+
+    return (s_xy - (s_x * s_l) / 3) / (s_x_sqr - (s_x ** 2) / 3)
+
+
+def weighted_changes(df):
+    """
+    Computes the weighted average change of every coin in one vectorized step.
+
+    Args:
+        df (pd.DataFrame | TickerTable): The cleaned snapshot.
+
+    Returns:
+        np.ndarray: One weighted average per coin, in row order.
+    """
+    return CHANGE_WEIGHTS @ _change_matrix(df) / CHANGE_WEIGHTS.sum()
+
 
 def min_squares_prediction(df, coin_name):
     """
@@ -11,30 +103,33 @@ def min_squares_prediction(df, coin_name):
     based on 1h, 24h, and 7d percent changes. Validates NumPy usage.
 
     Args:
-        df (pd.DataFrame): The cleaned DataFrame containing market data.
+        df (pd.DataFrame | TickerTable): The cleaned snapshot containing market data.
         coin_name (str): The name of the cryptocurrency to analyze.
 
     Returns:
         str: A message indicating the predicted trend.
     """
-    coin_data = df[df['name'] == coin_name]
-    if coin_data.empty:
+    row = _coin_row(df, coin_name)
+    if row is None:
         return f"Error: Coin '{coin_name}' not found for analysis."
 
-    # Extracting the three percent changes as the dependent variable (Y)
-    l = coin_data[['percent_change_1h', 'percent_change_24h', 'percent_change_7d']].values.flatten()
+    # Slope materialized at ingest, when the snapshot was loaded with its features
+    m = _row_feature(df, row, 'trend_slope')
+    if m is None:
+        # Extracting the three percent changes as the dependent variable (Y)
+        l = _row_changes(df, row)
 
-    # Abscissas (X) are defined for the trend calculation based on the original logic
-    x = np.array((0, 6.85, 7))
+        # Abscissas (X) are defined for the trend calculation based on the original logic
+        x = TREND_X
 
-    # Least Squares calculation for the slope (m)
-    s_x = np.sum(x)
-    s_l = np.sum(l)
-    s_xy = np.sum(x * l)
-    s_x_sqr = np.sum(x ** 2)
+        # Least Squares calculation for the slope (m)
+        s_x = np.sum(x)
+        s_l = np.sum(l)
+        s_xy = np.sum(x * l)
+        s_x_sqr = np.sum(x ** 2)
 
-    # Slope formula
-    m = (s_xy - (s_x * s_l) / 3) / (s_x_sqr - (s_x ** 2) / 3)
+        # Slope formula
+        m = (s_xy - (s_x * s_l) / 3) / (s_x_sqr - (s_x ** 2) / 3)
 
     if m < 0:
         trend = "Decrease"
@@ -62,18 +157,18 @@ def weighted_average_change(df, coin_name):
     (More weight on recent changes).
 
     Args:
-        df (pd.DataFrame): The cleaned DataFrame.
+        df (pd.DataFrame | TickerTable): The cleaned snapshot.
         coin_name (str): The name of the cryptocurrency to analyze.
 
     Returns:
         str: A formatted string with the weighted average.
     """
-    coin_data = df[df['name'] == coin_name]
-    if coin_data.empty: return {}, f"Error: Coin '{coin_name}' not found."
+    row = _coin_row(df, coin_name)
+    if row is None: return {}, f"Error: Coin '{coin_name}' not found."
 
-    wt = np.array([0.5, 0.333333, 0.1666666])
-    values = coin_data[['percent_change_1h', 'percent_change_24h', 'percent_change_7d']].values.flatten()
-    avg = np.average(values, weights=wt)
+    avg = _row_feature(df, row, 'weighted_change')
+    if avg is None:
+        avg = np.average(_row_changes(df, row), weights=CHANGE_WEIGHTS)
 
     results_dict = {
         'analysis_type': 'Weighted Average Change',
@@ -89,23 +184,26 @@ def weighted_average_change(df, coin_name):
 def get_best_growth_coin(df):
     """Identifies the coin with the best growth based on the weighted average."""
 
-    # Calculate the weighted average for all coins using a helper function
-    def calculate_weighted_avg(row):
-        wt = np.array([0.5, 0.333333, 0.1666666])
-        values = row[['percent_change_1h', 'percent_change_24h', 'percent_change_7d']].values
-        return np.average(values, weights=wt)
-
-    df['weighted_avg'] = df.apply(calculate_weighted_avg, axis=1)
+    # Use the materialized weighted change when present, otherwise calculate it for
+    # all coins in a single vectorized pass
+    if 'weighted_change' in df:
+        weighted_avg = np.asarray(df['weighted_change'], dtype=np.float64)
+    else:
+        weighted_avg = weighted_changes(df)
+    if not isinstance(df, TickerTable):
+        df['weighted_avg'] = weighted_avg
 
-    best_coin = df.loc[df['weighted_avg'].idxmax()]
+    best_row = np.nanargmax(weighted_avg)
+    best_name = df['name'][best_row] if isinstance(df, TickerTable) else df['name'].iloc[best_row]
+    best_avg = weighted_avg[best_row]
 
     results_dict = {
         'analysis_type': 'Best Growth Coin',
-        'coin_name': best_coin['name'],
-        'weighted_avg': round(best_coin['weighted_avg'], 4)
+        'coin_name': best_name,
+        'weighted_avg': round(best_avg, 4)
     }
 
-    output_msg = f"The coin with the best weighted growth rate is {best_coin['name']} with {best_coin['weighted_avg']:.4f}%"
+    output_msg = f"The coin with the best weighted growth rate is {best_name} with {best_avg:.4f}%"
 
     return results_dict, output_msg
 
@@ -114,7 +212,7 @@ def linear_regression_prediction(df, coin_name):
     Applies Linear Regression (Scikit-learn) using 7d change to predict USD price.
 
     Args:
-        df (pd.DataFrame): The cleaned DataFrame.
+        df (pd.DataFrame | TickerTable): The cleaned snapshot.
         coin_name (str): The name of the cryptocurrency to predict.
 
     Returns:
@@ -122,8 +220,8 @@ def linear_regression_prediction(df, coin_name):
     """
     # Prepare data (we use all points for the model)
     # X (Feature): 7-day change, Y (Target): USD Price
-    X = df['percent_change_7d'].values.reshape(-1, 1)
-    y = df['price_usd'].values
+    X = np.asarray(df['percent_change_7d'], dtype=np.float64).reshape(-1, 1)
+    y = np.asarray(df['price_usd'], dtype=np.float64)
 
     # Train the model
     model = LinearRegression()
@@ -134,7 +232,7 @@ def linear_regression_prediction(df, coin_name):
     r2 = r2_score(y, y_pred)
 
     # Predict a new simple value (We use the 7d value of the selected currency)
-    coin_7d_change = df[df['name'] == coin_name]['percent_change_7d'].values[0]
+    coin_7d_change = _coin_value(df, coin_name, 'percent_change_7d')
 
     # The prediction is simple: if the trend continues, what would be the price?
     predicted_price = model.predict(np.array([[coin_7d_change]]))[0]
@@ -161,20 +259,20 @@ def calculate_volatility(df, coin_name):
     over the last 7 days.
 
     Args:
-        df (pd.DataFrame): The cleaned DataFrame.
+        df (pd.DataFrame | TickerTable): The cleaned snapshot.
         coin_name (str): The name of the cryptocurrency.
 
     Returns:
         dict: Volatility statistics.
     """
-    coin_data = df[df['name'] == coin_name]
-    if coin_data.empty:
+    row = _coin_row(df, coin_name)
+    if row is None:
         return None, f"Error: Coin '{coin_name}' not found for volatility analysis."
 
-    # We use the three change points as a proxy for recent volatility
-    changes = coin_data[['percent_change_1h', 'percent_change_24h', 'percent_change_7d']].values.flatten()
-
-    std_dev = np.std(changes)
+    std_dev = _row_feature(df, row, 'volatility_std')
+    if std_dev is None:
+        # We use the three change points as a proxy for recent volatility
+        std_dev = np.std(_row_changes(df, row))
 
     if std_dev > 5:
         risk = "HIGH"
@@ -0,0 +1,379 @@
+import io
+import os
+import json
+import time
+import asyncio
+import argparse
+from concurrent.futures import ProcessPoolExecutor
+from urllib.parse import urlsplit, parse_qs, unquote
+
+import numpy as np
+
+import src.analysis_models as am
+import src.batch_analytics as ba
+import src.feature_store as fs
+import src.ranking as rk
+import src.shared_snapshot as ss
+from src.data_ingestion import REPORTS_DIR
+
+DEFAULT_HOST = '127.0.0.1'
+DEFAULT_PORT = 8765
+CHART_COLUMNS = {'percent_change_1h': "1 hour", 'percent_change_24h': "24 hours", 'percent_change_7d': "7 days"}
+
+HTTP_REASONS = {200: 'OK', 400: 'Bad Request', 404: 'Not Found', 405: 'Method Not Allowed',
+                500: 'Internal Server Error', 503: 'Service Unavailable'}
+
+
+# --- Worker-side functions (run inside the process pool) ---
+
+def _init_worker():
+    """Selects a non-interactive matplotlib backend before the visualizer is used."""
+    import matplotlib
+    matplotlib.use('Agg')
+
+
+def _build_snapshot(filename, previous, previous_name=None):
+    """
+    Parses a raw export and computes the per-coin model results.
+
+    Coins whose 1h/24h/7d changes match the previous snapshot reuse its results,
+    so a refresh only pays for the coins that actually moved.
+
+    Args:
+        filename (str): The raw export to load.
+        previous (dict): Maps coin name -> (changes tuple, results) from the previous snapshot.
+        previous_name (str): The export saved before filename, for the feature store.
+
+    Returns:
+        tuple: (TickerTable, per-coin results, best growth result, reused coin count)
+    """
+    table = fs.read_table_with_features(os.path.join(REPORTS_DIR, filename), previous_name)
+    per_coin = {}
+    reused = 0
+    for row, name in enumerate(table['name']):
+        if name in per_coin:
+            continue
+        changes = tuple(table.changes[:, row].tolist())
+        cached = previous.get(name)
+        if cached is not None and cached[0] == changes:
+            per_coin[name] = cached
+            reused += 1
+        else:
+            per_coin[name] = (changes, ba.analyse_coin(table, name))
+
+    best_growth, _ = am.get_best_growth_coin(table) if len(table) else ({}, None)
+    return table, per_coin, best_growth, reused
+
+
+# Model and chart workers read the snapshot from shared memory: a request only
+# ships the segment descriptor across the process boundary, never the data itself.
+
+def _run_regression(descriptor, coin_name):
+    result, _ = am.linear_regression_prediction(ss.attached_table(descriptor), coin_name)
+    return result
+
+
+def _render_chart(descriptor, kind, param):
+    """Renders a chart with the visualizer in memory and returns the PNG bytes."""
+    import src.visualizer as vis
+    df = ss.attached_table(descriptor)
+    png = io.BytesIO()
+    if kind == 'bar' and param in fs.FEATURE_COLUMNS:
+        vis.generate_feature_bar_chart(df, param, output=png)
+    elif kind == 'bar':
+        vis.generate_bar_chart(df, param, CHART_COLUMNS[param], output=png)
+    elif kind == 'regression':
+        vis.generate_regression_plot(df, output=png)
+    else:
+        vis.generate_trend_projection_plot(df, param, output=png)
+    return png.getvalue()
+
+
+# --- Service ---
+
+class HTTPError(Exception):
+    def __init__(self, status, message):
+        super().__init__(message)
+        self.status = status
+        self.message = message
+
+
+class AnalyticsService:
+    """
+    Local HTTP service that keeps the latest snapshot and its model results in memory.
+
+    The event loop only does I/O and dictionary lookups; parsing snapshots, fitting
+    models and rendering charts run in a process pool. Each snapshot is published
+    once to shared memory and the workers attach to it by name.
+
+    Routes (all GET):
+        /health                          Liveness and current snapshot name
+        /snapshot                        Snapshot metadata
+        /coins                           Coin names in rank order
+        /coins/<name>                    Precomputed per-coin model results
+        /coins/<name>/regression         Linear regression prediction
+        /best-growth                     Best growth coin
+        /rankings?score=&k=&bottom=&max_rank=&exclude_stablecoins=
+                                         Top-K (or bottom-K) leaderboard
+        /charts/bar?column=<column>      Bar chart PNG (percent_change_1h/24h/7d)
+        /charts/regression               Regression scatter plot PNG
+        /charts/projection?coin=<name>   Trend projection PNG
+    """
+
+    def __init__(self, host=DEFAULT_HOST, port=DEFAULT_PORT, workers=None, poll_interval=5.0):
+        self.host = host
+        self.port = port
+        self.poll_interval = poll_interval
+        ss.start_tracker()
+        self.executor = ProcessPoolExecutor(max_workers=workers, initializer=_init_worker)
+
+        self.filename = None
+        self.file_key = None
+        self.loaded_at = None
+        self.table = None
+        self.per_coin = {}
+        self.best_growth = {}
+        # The current snapshot in shared memory, plus the previous one so tasks
+        # submitted just before a swap can still attach to it
+        self.shared = None
+        self._retired = None
+        # Rendered charts and regression results for the current snapshot
+        self.cache = {}
+
+    # --- Snapshot refresh ---
+
+    async def refresh(self):
+        """Loads the newest raw export if it differs from the one being served."""
+        files = ba.list_snapshot_files()
+        if not files:
+            return False
+
+        newest = files[-1]
+        # Compare size and mtime too, so an export rewritten under the same name
+        # (or read while still being written) is picked up again on the next poll
+        stat = os.stat(os.path.join(REPORTS_DIR, newest))
+        file_key = (newest, stat.st_size, stat.st_mtime_ns)
+        if file_key == self.file_key:
+            return False
+
+        loop = asyncio.get_running_loop()
+        start = time.perf_counter()
+        table, per_coin, best_growth, reused = await loop.run_in_executor(
+            self.executor, _build_snapshot, newest, self.per_coin, files[-2] if len(files) > 1 else '')
+
+        shared = ss.SharedSnapshot(table)
+
+        # Swap everything at once; requests in flight keep the old references
+        if self._retired is not None:
+            self._retired.close()
+        self._retired = self.shared
+        self.table, self.per_coin, self.best_growth, self.shared = table, per_coin, best_growth, shared
+        self.filename = newest
+        self.file_key = file_key
+        self.loaded_at = time.strftime("%Y-%m-%d %H:%M:%S")
+        self.cache = {}
+
+        print(f"Loaded {newest}: {len(table)} coins, {reused} results reused "
+              f"({(time.perf_counter() - start) * 1000:.0f} ms)")
+        return True
+
+    async def _poll_snapshots(self):
+        while True:
+            await asyncio.sleep(self.poll_interval)
+            try:
+                await self.refresh()
+            except Exception as e:
+                print(f"Error refreshing snapshot: {e}")
+
+    # --- Request handling ---
+
+    async def _cached(self, key, func, *args):
+        """Runs func in the process pool once per snapshot and key."""
+        if key not in self.cache:
+            loop = asyncio.get_running_loop()
+            self.cache[key] = loop.run_in_executor(self.executor, func, self.shared.descriptor, *args)
+        try:
+            return await asyncio.shield(self.cache[key])
+        except Exception:
+            self.cache.pop(key, None)
+            raise
+
+    def _require_snapshot(self):
+        if self.table is None:
+            raise HTTPError(503, "No snapshot loaded yet. Fetch Tickers data first.")
+
+    def _require_coin(self, name):
+        if name not in self.per_coin:
+            raise HTTPError(404, f"Coin '{name}' not found.")
+
+    async def route(self, path, query):
+        """Returns (content type, body bytes) for a GET request."""
+        parts = [unquote(p) for p in path.strip('/').split('/') if p]
+
+        if parts == ['health']:
+            return self._json({'status': 'ok', 'snapshot': self.filename})
+
+        self._require_snapshot()
+
+        if parts == ['snapshot']:
+            return self._json({'snapshot': self.filename, 'loaded_at': self.loaded_at, 'coins': len(self.table)})
+        if parts == ['coins']:
+            return self._json(list(self.per_coin))
+        if parts == ['best-growth']:
+            return self._json(self.best_growth)
+        if parts == ['rankings']:
+            return self._json(self._rankings(query))
+        if len(parts) == 2 and parts[0] == 'coins':
+            self._require_coin(parts[1])
+            return self._json({'coin': parts[1], **self.per_coin[parts[1]][1]})
+        if len(parts) == 3 and parts[0] == 'coins' and parts[2] == 'regression':
+            self._require_coin(parts[1])
+            result = await self._cached(('regression', parts[1]), _run_regression, parts[1])
+            return self._json(result)
+
+        if len(parts) == 2 and parts[0] == 'charts':
+            if parts[1] == 'bar':
+                column = query.get('column', ['percent_change_24h'])[0]
+                if column not in CHART_COLUMNS and column not in fs.FEATURE_COLUMNS:
+                    raise HTTPError(400, "column must be one of "
+                                         f"{', '.join([*CHART_COLUMNS, *fs.FEATURE_COLUMNS])}.")
+                png = await self._cached(('bar', column), _render_chart, 'bar', column)
+            elif parts[1] == 'regression':
+                png = await self._cached(('regression_plot',), _render_chart, 'regression', None)
+            elif parts[1] == 'projection':
+                coin = query.get('coin', [None])[0]
+                if coin is None:
+                    raise HTTPError(400, "Missing 'coin' parameter.")
+                self._require_coin(coin)
+                png = await self._cached(('projection', coin), _render_chart, 'projection', coin)
+            else:
+                raise HTTPError(404, f"Unknown chart '{parts[1]}'.")
+            return 'image/png', png
+
+        raise HTTPError(404, f"Unknown route '{path}'.")
+
+    def _rankings(self, query):
+        """Builds a leaderboard from query parameters; partial selection is cheap enough to run inline."""
+        def param(name, default=None):
+            return query.get(name, [default])[0]
+
+        try:
+            k = int(param('k', 10))
+            max_rank = param('max_rank')
+            return rk.rank_coins(
+                self.table,
+                score=param('score', 'weighted_growth'),
+                k=k,
+                bottom=param('bottom', '0') in ('1', 'true'),
+                max_rank=int(max_rank) if max_rank is not None else None,
+                exclude_stablecoins=param('exclude_stablecoins', '0') in ('1', 'true'),
+            )
+        except ValueError as e:
+            raise HTTPError(400, str(e))
+
+    @staticmethod
+    def _json(payload):
+        return 'application/json', json.dumps(payload, default=_json_default).encode()
+
+    async def handle_connection(self, reader, writer):
+        """Serves HTTP/1.1 requests on one connection (keep-alive supported)."""
+        try:
+            while True:
+                request_line = await reader.readline()
+                if not request_line:
+                    break
+
+                headers = {}
+                while True:
+                    line = await reader.readline()
+                    if line in (b'\r\n', b'\n', b''):
+                        break
+                    key, _, value = line.decode('latin-1').partition(':')
+                    headers[key.strip().lower()] = value.strip()
+
+                try:
+                    method, target, version = request_line.decode('latin-1').split()
+                except ValueError:
+                    await self._respond(writer, 400, 'application/json', b'{"error": "Malformed request."}', False)
+                    break
+
+                keep_alive = (headers.get('connection', '').lower() != 'close'
+                              and version.upper() == 'HTTP/1.1')
+
+                try:
+                    if method != 'GET':
+                        raise HTTPError(405, "Only GET is supported.")
+                    url = urlsplit(target)
+                    content_type, body = await self.route(url.path, parse_qs(url.query))
+                    status = 200
+                except HTTPError as e:
+                    status, content_type = e.status, 'application/json'
+                    body = json.dumps({'error': e.message}).encode()
+                except Exception as e:
+                    status, content_type = 500, 'application/json'
+                    body = json.dumps({'error': str(e)}).encode()
+
+                await self._respond(writer, status, content_type, body, keep_alive)
+                if not keep_alive:
+                    break
+        except (ConnectionError, asyncio.IncompleteReadError):
+            pass
+        finally:
+            writer.close()
+
+    @staticmethod
+    async def _respond(writer, status, content_type, body, keep_alive):
+        head = (f"HTTP/1.1 {status} {HTTP_REASONS.get(status, '')}\r\n"
+                f"Content-Type: {content_type}\r\n"
+                f"Content-Length: {len(body)}\r\n"
+                f"Connection: {'keep-alive' if keep_alive else 'close'}\r\n\r\n")
+        writer.write(head.encode('latin-1') + body)
+        await writer.drain()
+
+    def close_shared(self):
+        for shared in (self.shared, self._retired):
+            if shared is not None:
+                shared.close()
+
+    async def serve_forever(self):
+        removed = ss.cleanup_stale_segments()
+        if removed:
+            print(f"Removed {len(removed)} shared memory segments left by a previous run.")
+        await self.refresh()
+        poller = asyncio.create_task(self._poll_snapshots())
+        server = await asyncio.start_server(self.handle_connection, self.host, self.port)
+        print(f"Analytics service listening on http://{self.host}:{self.port}")
+        try:
+            async with server:
+                await server.serve_forever()
+        finally:
+            poller.cancel()
+            self.executor.shutdown(cancel_futures=True)
+            self.close_shared()
+
+
+def _json_default(value):
+    """Serializes NumPy scalars returned by the models."""
+    if isinstance(value, np.generic):
+        return value.item()
+    raise TypeError(f"Object of type {type(value).__name__} is not JSON serializable")
+
+
+def run_service(host=DEFAULT_HOST, port=DEFAULT_PORT, workers=None, poll_interval=5.0):
+    """Starts the analytics service and blocks until interrupted (Ctrl+C)."""
+    service = AnalyticsService(host=host, port=port, workers=workers, poll_interval=poll_interval)
+    try:
+        asyncio.run(service.serve_forever())
+    except KeyboardInterrupt:
+        print("Analytics service stopped.")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Serve analytics and charts for the latest Tickers snapshot.")
+    parser.add_argument('--host', default=DEFAULT_HOST)
+    parser.add_argument('--port', type=int, default=DEFAULT_PORT)
+    parser.add_argument('--workers', type=int, default=None, help="Worker processes (default: CPU count).")
+    parser.add_argument('--poll', type=float, default=5.0, help="Seconds between checks for a new export.")
+    args = parser.parse_args()
+
+    run_service(host=args.host, port=args.port, workers=args.workers, poll_interval=args.poll)
@@ -0,0 +1,255 @@
+import os
+import json
+import time
+import argparse
+from multiprocessing import Pool
+
+import src.analysis_models as am
+import src.feature_store as fs
+import src.ranking as rk
+from src.data_ingestion import REPORTS_DIR, ensure_directory_exists
+from src.utils import REPORT_OUTPUT_DIR
+
+BATCH_OUTPUT_FILE = os.path.join(REPORT_OUTPUT_DIR, 'batch_analytics.jsonl')
+LEADERBOARD_SIZE = 10
+
+
+def list_snapshot_files(csv_dir=REPORTS_DIR):
+    """Returns the raw tickers exports in csv_dir, oldest first (timestamps sort lexically)."""
+    if not os.path.exists(csv_dir):
+        return []
+    return sorted(f for f in os.listdir(csv_dir) if f.endswith('.txt'))
+
+
+def analyse_coin(table, coin_name):
+    """
+    Runs the per-coin models (min squares, weighted average, volatility) for one coin.
+
+    Args:
+        table (TickerTable): The snapshot holding the coin.
+        coin_name (str): The coin to analyse.
+
+    Returns:
+        dict: The flattened model results.
+    """
+    trend, _ = am.min_squares_prediction(table, coin_name)
+    average, _ = am.weighted_average_change(table, coin_name)
+    volatility, _ = am.calculate_volatility(table, coin_name)
+    return {
+        'slope': trend['slope'],
+        'predicted_trend': trend['predicted_trend'],
+        'average_change': average['average_change'],
+        'volatility_std': volatility['volatility_std'],
+        'risk_level': volatility['risk_level'],
+    }
+
+
+def analyse_snapshot(table):
+    """
+    Runs the per-coin models and the best growth model over a whole snapshot.
+
+    Args:
+        table (TickerTable): The snapshot to analyse.
+
+    Returns:
+        dict: The best growth result, the weighted growth leaderboard and one
+        entry of model results per coin.
+    """
+    per_coin = {}
+    for name in table['name']:
+        if name not in per_coin:
+            per_coin[name] = analyse_coin(table, name)
+
+    best_growth, _ = am.get_best_growth_coin(table)
+
+    return {
+        'coins': len(table),
+        'best_growth': best_growth,
+        'leaderboard': rk.rank_coins(table, k=LEADERBOARD_SIZE),
+        'per_coin': per_coin,
+    }
+
+
+def _analyse_file(task):
+    """
+    Worker entry point: loads one raw export and analyses it.
+
+    Errors are returned instead of raised so one bad file does not stop the run.
+    """
+    csv_dir, filename, previous_name = task
+    try:
+        table = fs.read_table_with_features(os.path.join(csv_dir, filename), previous_name)
+        if table.empty:
+            return {'source_file': filename, 'error': "Empty snapshot."}
+        result = analyse_snapshot(table)
+        result['source_file'] = filename
+        return result
+    except Exception as e:
+        return {'source_file': filename, 'error': str(e)}
+
+
+def _manifest_path(output_path):
+    """The manifest of completed snapshots kept next to the batch output."""
+    return output_path + '.manifest'
+
+
+def _rebuild_manifest(output_path):
+    """
+    Builds the manifest from the batch output itself (outputs written before the
+    manifest existed). This is the only path that parses the full output.
+
+    A run that crashed mid-write can leave a truncated last line; invalid lines are
+    dropped and the file is rewritten so new results append cleanly.
+    """
+    completed = set()
+    valid_lines = []
+    corrupt = False
+    with open(output_path, 'r') as f:
+        for line in f:
+            try:
+                source_file = json.loads(line)['source_file']
+                completed.add(source_file)
+                valid_lines.append((source_file, line if line.endswith('\n') else line + '\n'))
+            except (json.JSONDecodeError, KeyError, TypeError):
+                corrupt = True
+
+    if corrupt:
+        with open(output_path, 'w') as f:
+            f.writelines(line for _, line in valid_lines)
+
+    offset = 0
+    with open(_manifest_path(output_path), 'w') as manifest:
+        for source_file, line in valid_lines:
+            offset += len(line.encode())
+            manifest.write(f"{source_file}\t{offset}\n")
+
+    return completed
+
+
+def _load_completed(output_path):
+    """
+    Reads the snapshots already present in the batch output from its manifest.
+
+    Every manifest line holds a snapshot name and the output size right after its
+    result was flushed, so resuming never parses the (large) output. Anything written
+    to the output after the last manifest entry - a truncated line, or a result whose
+    entry was never recorded - is cut off, and so is a truncated manifest line.
+    """
+    manifest_path = _manifest_path(output_path)
+    if not os.path.exists(output_path):
+        if os.path.exists(manifest_path):
+            os.remove(manifest_path)
+        return set()
+    if not os.path.exists(manifest_path):
+        return _rebuild_manifest(output_path)
+
+    completed = set()
+    output_end = manifest_end = 0
+    with open(manifest_path, 'rb') as manifest:
+        for line in manifest:
+            try:
+                source_file, offset = line.decode().rstrip('\n').split('\t')
+                offset = int(offset)
+            except ValueError:
+                break
+            if not line.endswith(b'\n'):
+                break
+            completed.add(source_file)
+            output_end = offset
+            manifest_end += len(line)
+
+    if os.path.getsize(output_path) < output_end:
+        # The output was changed behind the manifest's back: trust the output
+        return _rebuild_manifest(output_path)
+
+    os.truncate(manifest_path, manifest_end)
+    os.truncate(output_path, output_end)
+    return completed
+
+
+def run_batch_analytics(csv_dir=REPORTS_DIR, output_path=BATCH_OUTPUT_FILE, workers=None,
+                        chunksize=None, resume=True, progress_every=1.0):
+    """
+    Analyses every raw export in csv_dir across a process pool.
+
+    Results stream back as workers finish and are appended to a JSON Lines file,
+    one line per snapshot, so a crashed or interrupted run can be resumed: files
+    recorded in the output's manifest are skipped.
+
+    Args:
+        csv_dir (str): Directory holding the raw exports.
+        output_path (str): The aggregated JSON Lines output.
+        workers (int): Number of worker processes (defaults to the CPU count).
+        chunksize (int): Files handed to a worker at a time (derived from the file count if None).
+        resume (bool): Skip files already in the output. If False the output is overwritten.
+        progress_every (float): Seconds between progress lines.
+
+    Returns:
+        dict: Counts of analysed, skipped and failed snapshots.
+    """
+    ensure_directory_exists(os.path.dirname(output_path))
+
+    files = list_snapshot_files(csv_dir)
+    if resume:
+        completed = _load_completed(output_path)
+    else:
+        completed = set()
+        open(output_path, 'w').close()
+        open(_manifest_path(output_path), 'w').close()
+
+    pending = [f for f in files if f not in completed]
+    summary = {'total': len(files), 'skipped': len(files) - len(pending), 'analysed': 0, 'failed': 0}
+
+    if not pending:
+        print(f"Nothing to do: all {len(files)} snapshots are already in {output_path}")
+        return summary
+
+    workers = workers or os.cpu_count() or 1
+    workers = min(workers, len(pending))
+    # Large enough chunks to amortize IPC, small enough to keep every worker busy
+    chunksize = chunksize or max(1, len(pending) // (workers * 8))
+
+    print(f"Analysing {len(pending)} snapshots with {workers} workers "
+          f"({summary['skipped']} already done)...")
+
+    start = last_report = time.perf_counter()
+    # Each task carries the export saved before it (for the feature store), taken
+    # from the sorted list so workers never have to list the directory
+    previous_names = dict(zip(files, [''] + files[:-1]))
+    tasks = [(csv_dir, f, previous_names[f]) for f in pending]
+
+    with Pool(processes=workers) as pool, open(output_path, 'a') as out, \
+            open(_manifest_path(output_path), 'a') as manifest:
+        for done, result in enumerate(pool.imap_unordered(_analyse_file, tasks, chunksize=chunksize), 1):
+            if 'error' in result:
+                summary['failed'] += 1
+                print(f"Error analysing {result['source_file']}: {result['error']}")
+            else:
+                summary['analysed'] += 1
+                out.write(json.dumps(result) + '\n')
+                # Flush per line so a crash loses at most the snapshot being written,
+                # then record it as completed (with the output size) in the manifest
+                out.flush()
+                manifest.write(f"{result['source_file']}\t{out.tell()}\n")
+                manifest.flush()
+
+            now = time.perf_counter()
+            if now - last_report >= progress_every or done == len(pending):
+                rate = done / (now - start)
+                print(f"Processed {done}/{len(pending)} snapshots ({rate:.1f} files/s)")
+                last_report = now
+
+    print(f"Batch results saved to: {output_path}")
+    return summary
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Run the analysis models over every raw tickers export.")
+    parser.add_argument('--workers', type=int, default=None, help="Worker processes (default: CPU count).")
+    parser.add_argument('--chunksize', type=int, default=None, help="Files handed to a worker at a time.")
+    parser.add_argument('--output', default=BATCH_OUTPUT_FILE, help="JSON Lines output file.")
+    parser.add_argument('--no-resume', action='store_true', help="Start over instead of skipping done files.")
+    args = parser.parse_args()
+
+    run_batch_analytics(output_path=args.output, workers=args.workers,
+                        chunksize=args.chunksize, resume=not args.no_resume)
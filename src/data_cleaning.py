@@ -2,6 +2,8 @@
 import os
 import pandas as pd
 
+import src.feature_store as fs
+
 
 def load_data_from_csv(filename):
     """
@@ -36,8 +38,19 @@ def load_data_from_csv(filename):
             # Use .loc for safe assignment
             df.loc[:, col] = pd.to_numeric(df[col], errors='coerce')
 
-        return df
-
     except Exception as e:
         print(f"Error loading or cleaning the DataFrame: {e}")
-        return pd.DataFrame()
\ No newline at end of file
+        return pd.DataFrame()
+
+    # Attach the derived features materialized at ingest as extra columns, so the
+    # models and charts read them instead of recomputing them
+    try:
+        features = fs.load_features(filepath)
+        if len(df) == len(features['weighted_change']):
+            for name, values in features.items():
+                df[name] = values
+    except Exception as e:
+        # Features are optional: any failure leaves the DataFrame usable without them
+        print(f"Warning: derived features are not available ({e})")
+
+    return df
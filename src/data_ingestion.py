@@ -24,22 +24,35 @@ def save_data_to_csv(data, filename_prefix, fieldnames):
     """
     Saves a list of dictionaries to a CSV file in the raw exports' directory.
 
+    The file is written under a temporary name and renamed when complete, so
+    readers polling the directory never see a half-written export.
+
     Returns the full path of the saved file.
     """
     ensure_directory_exists(REPORTS_DIR)
 
     timestamp = datetime.datetime.now().strftime("%Y-%m-%d_%H-%M-%S")
     filepath = os.path.join(REPORTS_DIR, f"{filename_prefix}_{timestamp}.txt")
+    temporary = filepath + '.tmp'
 
-    with open(filepath, 'w', newline='') as csvfile:
+    with open(temporary, 'w', newline='') as csvfile:
         writer = csv.DictWriter(csvfile, fieldnames=fieldnames)
         writer.writeheader()
         for item in data:
             writer.writerow(item)
 
+    os.replace(temporary, filepath)
     return filepath
 
 
+def previous_snapshot_path(filepath):
+    """Returns the path of the raw export saved just before filepath, or None."""
+    directory, filename = os.path.split(filepath)
+    # A single pass over the directory; names sort by their capture timestamp
+    previous = max((f for f in os.listdir(directory) if f.endswith('.txt') and f < filename), default=None)
+    return os.path.join(directory, previous) if previous else None
+
+
 def fetch_and_save_tickers():
     """Fetches the top 10 tickers from the API and saves the raw data."""
     API_URL = "https://api.coinlore.net/api/tickers/?start=0&limit=10"
@@ -58,6 +71,8 @@ def fetch_and_save_tickers():
                 fieldnames=TICKERS_FIELDNAMES
             )
             print(f"Ticker data successfully saved to: {filepath}")
+            run_feature_materialization(filepath)
+            run_snapshot_alerts(filepath)
             return filepath
         else:
             print("Error: API returned no data.")
@@ -68,6 +83,32 @@ def fetch_and_save_tickers():
         return None
 
 
+def run_feature_materialization(filepath):
+    """Computes and stores the derived features of a snapshot that has just been saved."""
+    # Imported here: the feature store depends on this module
+    from src.feature_store import materialize_features
+
+    try:
+        materialize_features(filepath)
+    except (OSError, ValueError) as e:
+        print(f"Error materializing derived features: {e}")
+
+
+def run_snapshot_alerts(filepath):
+    """Evaluates the alert rules against a snapshot that has just been saved."""
+    # Imported here: the alerts module depends on this one
+    from src.alerts import evaluate_snapshot_alerts, ALERTS_OUTPUT_FILE
+
+    try:
+        alerts = evaluate_snapshot_alerts(filepath)
+    except (ValueError, KeyError, json.JSONDecodeError) as e:
+        print(f"Error in alert rules: {e}")
+        return
+
+    if alerts:
+        print(f"{len(alerts)} alerts fired. Details saved to: {ALERTS_OUTPUT_FILE}")
+
+
 def fetch_and_save_markets():
     print("Market fetch logic needs a coin ID. Check main menu flow.")
     return None
\ No newline at end of file
@@ -0,0 +1,178 @@
+import os
+import zipfile
+import argparse
+import numpy as np
+
+import src.analysis_models as am
+from src.data_ingestion import REPORTS_DIR, previous_snapshot_path
+from src.ticker_table import read_ticker_table
+
+# Bump whenever a feature definition below changes: stored features with another
+# version are recomputed the next time they are loaded.
+FEATURES_VERSION = 1
+
+FEATURE_COLUMNS = ['weighted_change', 'trend_slope', 'volatility_std',
+                   'volume_to_market_cap', 'log_return_price']
+
+# Features are stored next to the raw export they were computed from
+FEATURES_SUFFIX = '.features.npz'
+
+
+def features_path(filepath):
+    """Returns the feature file that belongs to a raw export."""
+    return os.path.splitext(filepath)[0] + FEATURES_SUFFIX
+
+
+def compute_features(table, previous=None):
+    """
+    Computes every derived feature of a snapshot in vectorized passes.
+
+    Args:
+        table (TickerTable): The snapshot.
+        previous (TickerTable): The snapshot saved before it, for the log returns.
+
+    Returns:
+        dict: Maps each FEATURE_COLUMNS entry to one float per coin, in row order.
+    """
+    features = {
+        'weighted_change': am.weighted_changes(table),
+        'trend_slope': am.trend_slopes(table),
+        'volatility_std': np.std(table.changes, axis=0),
+    }
+    with np.errstate(divide='ignore', invalid='ignore'):
+        features['volume_to_market_cap'] = table['volume24'] / table['market_cap_usd']
+
+    # Log return of the price since the previous snapshot, matching coins by id
+    # (NaN for new coins, or when there is no previous snapshot)
+    previous_price = np.full(len(table), np.nan)
+    if previous is not None:
+        rows = table.align_to(previous)
+        matched = rows >= 0
+        previous_price[matched] = previous['price_usd'][rows[matched]]
+    with np.errstate(divide='ignore', invalid='ignore'):
+        features['log_return_price'] = np.log(table['price_usd'] / previous_price)
+
+    return {name: np.asarray(features[name], dtype=np.float64) for name in FEATURE_COLUMNS}
+
+
+def save_features(filepath, table, features, previous_name=None):
+    """Writes the features of a raw export to its feature file (atomically)."""
+    target = features_path(filepath)
+    temporary = target + '.tmp'
+    with open(temporary, 'wb') as f:
+        np.savez(f,
+                 version=np.int64(FEATURES_VERSION),
+                 ids=np.asarray(table.ids, dtype=str),
+                 previous=np.str_(previous_name or ''),
+                 **features)
+    os.replace(temporary, target)
+    return target
+
+
+def _previous_name(filepath, previous_name):
+    """
+    Resolves the name of the export saved before filepath ('' if there is none).
+    Only lists the directory when the caller does not already know it.
+    """
+    if previous_name is not None:
+        return previous_name
+    previous_path = previous_snapshot_path(filepath)
+    return os.path.basename(previous_path) if previous_path else ''
+
+
+def materialize_features(filepath, table=None, previous_name=None):
+    """
+    Computes and stores the derived features of a raw export.
+
+    Args:
+        filepath (str): Full path of the raw export.
+        table (TickerTable): The parsed export, when the caller already has it.
+        previous_name (str): Name of the export saved just before this one ('' if
+            none). Looked up in the directory when None.
+
+    Returns:
+        dict: The computed features.
+    """
+    if table is None:
+        table = read_ticker_table(filepath)
+
+    previous_name = _previous_name(filepath, previous_name)
+    previous = None
+    if previous_name:
+        previous = read_ticker_table(os.path.join(os.path.dirname(filepath), previous_name))
+
+    features = compute_features(table, previous)
+    save_features(filepath, table, features, previous_name)
+    return features
+
+
+def _read_stored(filepath, ids, previous_name):
+    """Returns the stored features if they are current and match ids, otherwise None."""
+    path = features_path(filepath)
+    if not os.path.exists(path) or os.path.getmtime(path) < os.path.getmtime(filepath):
+        return None
+
+    previous_name = _previous_name(filepath, previous_name)
+    try:
+        with np.load(path) as stored:
+            if int(stored['version']) != FEATURES_VERSION:
+                return None
+            # The log returns depend on which snapshot came before this one
+            if str(stored['previous']) != previous_name:
+                return None
+            if ids is not None and not np.array_equal(stored['ids'], np.asarray(ids, dtype=str)):
+                return None
+            return {name: stored[name] for name in FEATURE_COLUMNS}
+    except (OSError, ValueError, KeyError, zipfile.BadZipFile):
+        # Truncated or foreign file: recompute it
+        return None
+
+
+def load_features(filepath, table=None, previous_name=None):
+    """
+    Loads the materialized features of a raw export.
+
+    Features that are missing, older than the export, stored with another
+    FEATURES_VERSION, or computed against another previous export are recomputed
+    and stored again.
+
+    Args:
+        filepath (str): Full path of the raw export.
+        table (TickerTable): The parsed export, when the caller already has it.
+        previous_name (str): Name of the export saved just before this one ('' if
+            none). Callers iterating a sorted file list should pass it, otherwise
+            the directory is listed on every load.
+
+    Returns:
+        dict: Maps each FEATURE_COLUMNS entry to one float per coin, in row order.
+    """
+    previous_name = _previous_name(filepath, previous_name)
+    features = _read_stored(filepath, table.ids if table is not None else None, previous_name)
+    if features is None:
+        features = materialize_features(filepath, table, previous_name)
+    return features
+
+
+def read_table_with_features(filepath, previous_name=None):
+    """Parses a raw export into a TickerTable with its materialized features attached."""
+    table = read_ticker_table(filepath)
+    table.features = load_features(filepath, table, previous_name)
+    return table
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Materialize the derived features of the raw tickers exports.")
+    parser.add_argument('snapshots', nargs='*', help="Raw export file names (default: every file).")
+    parser.add_argument('--force', action='store_true', help="Recompute features that are already current.")
+    args = parser.parse_args()
+
+    all_files = sorted(f for f in os.listdir(REPORTS_DIR) if f.endswith('.txt'))
+    previous_names = dict(zip(all_files, [''] + all_files[:-1]))
+    for filename in args.snapshots or all_files:
+        path = os.path.join(REPORTS_DIR, filename)
+        previous_name = previous_names.get(filename)
+        if args.force:
+            materialize_features(path, previous_name=previous_name)
+        else:
+            load_features(path, previous_name=previous_name)
+        print(f"Features ready: {features_path(path)}")
@@ -0,0 +1,59 @@
+import os
+import re
+import numpy as np
+
+from src.data_ingestion import REPORTS_DIR
+from src.ticker_table import read_ticker_table
+
+# Raw exports are named <prefix>_YYYY-MM-DD_HH-MM-SS.txt by save_data_to_csv
+_TIMESTAMP_PATTERN = re.compile(r'(\d{4}-\d{2}-\d{2})_(\d{2})-(\d{2})-(\d{2})')
+
+
+def snapshot_timestamp(filename):
+    """Returns the capture time encoded in a raw export name as np.datetime64, or None."""
+    match = _TIMESTAMP_PATTERN.search(filename)
+    if not match:
+        return None
+    day, hours, minutes, seconds = match.groups()
+    return np.datetime64(f"{day}T{hours}:{minutes}:{seconds}", 's')
+
+
+def load_history(coin_names, columns=('price_usd',), csv_dir=REPORTS_DIR):
+    """
+    Builds per-coin time series from every raw export in csv_dir.
+
+    Args:
+        coin_names (list): Coins to extract.
+        columns (tuple): Numeric columns to extract (e.g. 'price_usd', 'volume24').
+        csv_dir (str): Directory holding the raw exports.
+
+    Returns:
+        dict: 'time' -> datetime64 array of shape (n_snapshots,), 'coins' -> coin_names,
+        and one (n_coins, n_snapshots) float array per column. Snapshots where a coin
+        is missing hold NaN.
+    """
+    files = []
+    if os.path.exists(csv_dir):
+        for filename in os.listdir(csv_dir):
+            timestamp = snapshot_timestamp(filename) if filename.endswith('.txt') else None
+            if timestamp is not None:
+                files.append((timestamp, filename))
+    files.sort()
+
+    history = {
+        'time': np.array([t for t, _ in files], dtype='datetime64[s]'),
+        'coins': list(coin_names),
+    }
+    for column in columns:
+        history[column] = np.full((len(coin_names), len(files)), np.nan)
+
+    for j, (_, filename) in enumerate(files):
+        table = read_ticker_table(os.path.join(csv_dir, filename))
+        rows = [table.row_of(name) for name in coin_names]
+        for column in columns:
+            values = table[column]
+            for i, row in enumerate(rows):
+                if row is not None:
+                    history[column][i, j] = values[row]
+
+    return history
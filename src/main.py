@@ -5,6 +5,10 @@ import src.data_cleaning as dc
 import src.analysis_models as am
 import src.visualizer as vis
 import src.utils as utils
+import src.batch_analytics as ba
+import src.ranking as rk
+import src.history as hist
+import src.snapshot_diff as sd
 
 
 # --- Main Menu Functions ---
@@ -61,14 +65,14 @@ def handle_analytics():
         print("Analysis Submenu:\n")
         print("--- Basic Models ---\n 1. Predict Future Trend (Min Squares)\n 2. Weighted Average Change\n")
         print(
-            "--- Advanced Models ---\n 3. Linear Regression (Scikit-learn)\n 4. Volatility and Risk Analysis\n 5. Best Growth Coin\n")
-        print(" 6. Return to Main Menu\n")
+            "--- Advanced Models ---\n 3. Linear Regression (Scikit-learn)\n 4. Volatility and Risk Analysis\n 5. Best Growth Coin\n 6. Top-K Leaderboard\n")
+        print(" 7. Return to Main Menu\n")
 
-        # Validation range updated to [1, 6]
-        option = utils.input_validated_int(1, 6, "Select an analysis option:")
+        # Validation range updated to [1, 7]
+        option = utils.input_validated_int(1, 7, "Select an analysis option:")
         utils.print_separator(0)
 
-        if option == 6:
+        if option == 7:
             break
 
         # Initialize variables
@@ -103,6 +107,9 @@ def handle_analytics():
             # Best Growth Coin no necesita selección de moneda
             result_dict, output_msg = am.get_best_growth_coin(df)
 
+        elif option == 6:
+            result_dict, output_msg = select_leaderboard(df)
+
         # Generate Report (Now use dictionary and message)
         # Only runs if results are not empty (search failure, etc.)
         if result_dict and output_msg:
@@ -111,6 +118,43 @@ def handle_analytics():
         utils.print_separator(1)
 
 
+def select_leaderboard(df):
+    """Asks for the leaderboard settings and builds the Top-K ranking."""
+    metrics = list(rk.SCORE_FUNCTIONS)
+    print("Select the ranking metric:")
+    for i, metric in enumerate(metrics):
+        print(f" {i + 1}. {metric}")
+    metric = metrics[utils.input_validated_int(1, len(metrics), "Select a metric:") - 1]
+
+    print("Direction:\n 1. Top (highest first)\n 2. Bottom (lowest first)")
+    bottom = utils.input_validated_int(1, 2, "Select a direction:") == 2
+
+    k = utils.input_validated_int(1, len(df), "How many coins (K)?")
+
+    print("Exclude stablecoins?\n 1. Yes\n 2. No")
+    exclude_stablecoins = utils.input_validated_int(1, 2, "Select an option:") == 1
+
+    return rk.top_k_ranking(df, score=metric, k=k, bottom=bottom, exclude_stablecoins=exclude_stablecoins)
+
+
+def handle_batch_analytics():
+    """Runs the analysis models over every saved Tickers file."""
+    files = ba.list_snapshot_files()
+    if not files:
+        print("You must fetch Tickers data first (Menu 1, Option 1) to perform analysis.")
+        return
+
+    print(f"{len(files)} Tickers files found.")
+    print(" 1. Resume (skip files already analysed)\n 2. Start over\n 3. Return to Main Menu")
+    option = utils.input_validated_int(1, 3, "Select an option:")
+
+    if option == 3:
+        return
+
+    summary = ba.run_batch_analytics(resume=(option == 1))
+    print(f"\nAnalysed: {summary['analysed']} | Skipped: {summary['skipped']} | Failed: {summary['failed']}")
+
+
 def handle_visualization():
     """Handles the 'Graficas' submenu."""
 
@@ -149,9 +193,13 @@ def handle_visualization():
     print(" 1. Bar Chart (Change over time)\n")
     print("--- Advanced Analysis Charts ---")
     print(" 2. Regression Scatter Plot (7d Change vs. Price)\n 3. Trend Projection (Line Plot)\n")
+    print("--- History Charts (All Files) ---")
+    print(" 4. Price / Volume History\n")
+    print("--- Derived Feature Charts (Precomputed) ---")
+    print(" 5. Feature Bar Chart (Weighted change, Volatility, ...)\n")
 
-    # New validation range: [1, 3]
-    option = utils.input_validated_int(1, 3, "Select an option:")
+    # New validation range: [1, 5]
+    option = utils.input_validated_int(1, 5, "Select an option:")
 
     if option == 1:
         # Submenu for Bar Chart time selection (reusing old logic)
@@ -181,6 +229,34 @@ def handle_visualization():
 
         filepath = vis.generate_trend_projection_plot(df, selected_coin)
 
+    elif option == 4:
+        # History - one or many coins overlaid, read from every saved file
+        print("Select the series: 1. Price (USD), 2. Volume 24h, 3. Market Cap (USD)")
+        column = ['price_usd', 'volume24', 'market_cap_usd'][utils.input_validated_int(1, 3, "Select an option:") - 1]
+
+        coin_names = df['name'].tolist()
+        n_coins = utils.input_validated_int(1, len(coin_names), "How many coins to overlay?")
+        print("\nSelect the coins:")
+        for i, name in enumerate(coin_names):
+            print(f" {i + 1}. {name}")
+        selected_coins = []
+        while len(selected_coins) < n_coins:
+            name = coin_names[utils.input_validated_int(1, len(coin_names), "Select a coin:") - 1]
+            if name not in selected_coins:
+                selected_coins.append(name)
+
+        history = hist.load_history(selected_coins, columns=(column,))
+        filepath = vis.generate_history_plot(history, column=column)
+
+    elif option == 5:
+        # Derived features are read from the columns materialized at ingest
+        features = list(vis.FEATURE_LABELS)
+        print("Select the feature:")
+        for i, feature in enumerate(features):
+            print(f" {i + 1}. {vis.FEATURE_LABELS[feature]}")
+        feature = features[utils.input_validated_int(1, len(features), "Select an option:") - 1]
+        filepath = vis.generate_feature_bar_chart(df, feature)
+
     # Print the save path if a file was generated
     if filepath:
         print(f"Visualization saved to: {filepath}")
@@ -188,6 +264,46 @@ def handle_visualization():
     utils.print_separator(1)
 
 
+def handle_snapshot_diff(csv_dir):
+    """Compares two selected Tickers files by coin id and saves the diff to the newer file's report."""
+    available_files = sorted(f for f in os.listdir(csv_dir) if f.endswith('.txt'))
+    if len(available_files) < 2:
+        print("At least two Tickers files are needed for a diff.")
+        utils.print_separator(1)
+        return
+
+    for i, file in enumerate(available_files):
+        print(f" {i + 1}. {file}")
+    old_file = available_files[utils.input_validated_int(1, len(available_files), "Select the OLDER file:") - 1]
+    new_file = available_files[utils.input_validated_int(1, len(available_files), "Select the NEWER file:") - 1]
+
+    # File names sort by their capture timestamp
+    if old_file >= new_file:
+        print("Error: The NEWER file must be a different, later file than the OLDER one.")
+        utils.print_separator(1)
+        return
+
+    report = sd.diff_chain([os.path.join(csv_dir, old_file), os.path.join(csv_dir, new_file)])
+    diff = report['steps'][0]
+    utils.generate_report_file(new_file, diff, sd.format_diff(diff))
+    utils.print_separator(1)
+
+
+def handle_snapshot_diff_chain(csv_dir):
+    """Diffs every pair of consecutive Tickers files and saves the chain as one JSON report."""
+    available_files = sorted(f for f in os.listdir(csv_dir) if f.endswith('.txt'))
+    if len(available_files) < 2:
+        print("At least two Tickers files are needed for a diff.")
+        utils.print_separator(1)
+        return
+
+    print(f"Comparing {len(available_files)} files...")
+    report = sd.diff_chain([os.path.join(csv_dir, f) for f in available_files])
+    print(sd.format_diff(report.get('overall', report['steps'][-1])))
+    print(f"\nDiff report saved to: {sd.save_chain_report(report)}")
+    utils.print_separator(1)
+
+
 def handle_records_consults():
     """
     Handles the 'Records Consults' submenu.
@@ -199,6 +315,19 @@ def handle_records_consults():
         utils.print_separator(1)
         return
 
+    print("Records Consult Menu:\n 1. View Cleaned DataFrame\n 2. Compare Two Files (Diff)\n 3. Diff Every Consecutive File\n 4. Return to Main Menu")
+    option = utils.input_validated_int(1, 4, "Select an option:")
+    utils.print_separator(0)
+
+    if option == 2:
+        handle_snapshot_diff(csv_dir)
+        return
+    elif option == 3:
+        handle_snapshot_diff_chain(csv_dir)
+        return
+    elif option == 4:
+        return
+
     print("Select the raw data file to view as a clean DataFrame:")
     available_files = [f for f in os.listdir(csv_dir) if f.endswith('.txt') or f.endswith('.csv')]
 
@@ -244,11 +373,11 @@ def handle_records_consults():
 def main_menu():
     """The main application loop."""
     option = 0
-    while option != 6:
+    while option != 7:
         print("\n**Welcome to CMA CLI Tool. Select an option.**\n")
         print(
-            "Main Menu Options:\n 1. Web Consults\n 2. Records Consults\n 3. Analytics\n 4. Visualizations\n 5. Delete All Reports\n 6. Exit\n")
-        option = utils.input_validated_int(1, 6, "Select an option:")
+            "Main Menu Options:\n 1. Web Consults\n 2. Records Consults\n 3. Analytics\n 4. Visualizations\n 5. Batch Analytics (All Files)\n 6. Delete All Reports\n 7. Exit\n")
+        option = utils.input_validated_int(1, 7, "Select an option:")
         utils.print_separator(0)
 
         if option == 1:
@@ -261,8 +390,15 @@ def main_menu():
         elif option == 4:
             handle_visualization()
         elif option == 5:
-            utils.clear_all_reports()
+            handle_batch_analytics()
         elif option == 6:
+            # Deleting cannot be undone, so it always asks first
+            print("This deletes every saved report, chart and raw export.")
+            if utils.input_validated_int(1, 2, "Confirm: 1. Delete everything, 2. Cancel") == 1:
+                utils.clear_all_reports()
+            else:
+                print("Deletion cancelled.")
+        elif option == 7:
             print("Exiting application. Goodbye!")
 
         utils.print_separator(1)
@@ -0,0 +1,228 @@
+import numpy as np
+
+from src.analysis_models import weighted_changes
+from src.ticker_table import TickerTable, CHANGE_COLUMNS
+
+# Symbols treated as stablecoins by the exclude_stablecoins filter
+STABLECOIN_SYMBOLS = {'USDT', 'USDC', 'DAI', 'BUSD', 'TUSD', 'USDP', 'FDUSD', 'USDD', 'PYUSD',
+                      'USDE', 'USDS', 'GUSD', 'FRAX', 'LUSD', 'SUSD', 'EURC', 'EURS', 'USD1'}
+
+
+def _numeric(data, column):
+    return np.asarray(data[column], dtype=np.float64)
+
+
+def _changes(data):
+    """The 1h/24h/7d changes as a (3, n_coins) array."""
+    if isinstance(data, TickerTable):
+        return data.changes
+    return data[CHANGE_COLUMNS].to_numpy(dtype=np.float64).T
+
+
+def _volatility(data):
+    return np.std(_changes(data), axis=0)
+
+
+def _volume_to_market_cap(data):
+    with np.errstate(divide='ignore', invalid='ignore'):
+        return _numeric(data, 'volume24') / _numeric(data, 'market_cap_usd')
+
+
+def _materialized(feature, compute):
+    """Reads a feature materialized at ingest (src.feature_store) when the snapshot has it."""
+    return lambda data: _numeric(data, feature) if feature in data else compute(data)
+
+
+# Built-in score functions: each maps a snapshot to one float per coin
+SCORE_FUNCTIONS = {
+    'weighted_growth': _materialized('weighted_change', weighted_changes),
+    'volatility': _materialized('volatility_std', _volatility),
+    'volume_to_market_cap': _materialized('volume_to_market_cap', _volume_to_market_cap),
+    'percent_change_1h': lambda data: _numeric(data, 'percent_change_1h'),
+    'percent_change_24h': lambda data: _numeric(data, 'percent_change_24h'),
+    'percent_change_7d': lambda data: _numeric(data, 'percent_change_7d'),
+}
+
+
+def weighted_score(weights):
+    """
+    Builds a score function with custom weights for the 1h, 24h and 7d changes.
+
+    Args:
+        weights (list): Three weights, e.g. [0.2, 0.3, 0.5].
+    """
+    weights = np.asarray(weights, dtype=np.float64)
+    if weights.shape != (3,) or weights.sum() == 0:
+        raise ValueError("Custom weights must be three numbers that do not sum to zero.")
+    return lambda data: weights @ _changes(data) / weights.sum()
+
+
+def _select(scores, candidates, k, largest, tie_key, include_ties):
+    """
+    Picks the k best candidates with a partial selection, then orders only those.
+
+    Args:
+        scores (np.ndarray): Score per coin (already without NaN for the candidates).
+        candidates (np.ndarray): Row indexes eligible for the ranking.
+        k (int): Number of entries wanted.
+        largest (bool): True for the top K, False for the bottom K.
+        tie_key (np.ndarray): Secondary sort key per coin (ascending) to break ties.
+        include_ties (bool): Keep every coin tied with the K-th score, even past K.
+
+    Returns:
+        np.ndarray: The selected row indexes, best first.
+    """
+    # Negate for the top K so "smaller is better" holds in both directions
+    keys = -scores[candidates] if largest else scores[candidates]
+
+    if k < len(candidates):
+        # O(n) selection of the k smallest keys; no full sort of the universe.
+        # Every coin tied with the K-th key is kept so the tie-break below decides
+        # which of them make the cut, instead of argpartition's arbitrary order.
+        part = np.argpartition(keys, k - 1)[:k]
+        kth = keys[part].max()
+        part = np.flatnonzero(keys <= kth)
+        chosen = candidates[part]
+        chosen_keys = keys[part]
+    else:
+        chosen = candidates
+        chosen_keys = keys
+
+    order = np.lexsort((tie_key[chosen], chosen_keys))
+    selected = chosen[order]
+    if not include_ties:
+        selected = selected[:k]
+    return selected
+
+
+def select_top_k(scores, k, bottom=False, ranks=None, mask=None, include_ties=False):
+    """
+    Row indexes of the K best scores, using partial selection.
+
+    Args:
+        scores (np.ndarray): One score per coin; NaN scores are never selected.
+        k (int): Number of rows wanted.
+        bottom (bool): Select the lowest scores instead of the highest.
+        ranks (np.ndarray): Market-cap ranks used to break ties (lower rank first).
+        mask (np.ndarray): Optional boolean filter of eligible rows.
+        include_ties (bool): Also return rows tied with the K-th score.
+
+    Returns:
+        np.ndarray: Row indexes, best first.
+    """
+    scores = np.asarray(scores, dtype=np.float64)
+    eligible = np.isfinite(scores)
+    if mask is not None:
+        eligible &= mask
+    candidates = np.flatnonzero(eligible)
+    if len(candidates) == 0:
+        return candidates
+
+    if ranks is None:
+        tie_key = np.arange(len(scores), dtype=np.float64)
+    else:
+        # Coins without a rank go last among ties
+        tie_key = np.where(np.isfinite(ranks), ranks, np.inf)
+    return _select(scores, candidates, k, not bottom, tie_key, include_ties)
+
+
+def rank_coins(data, score='weighted_growth', k=10, bottom=False, weights=None, min_rank=None,
+               max_rank=None, exclude_stablecoins=False, exclude=None, include_ties=False):
+    """
+    Builds a top-K (or bottom-K) leaderboard over a snapshot.
+
+    Args:
+        data (pd.DataFrame | TickerTable): The cleaned snapshot.
+        score (str | callable): A SCORE_FUNCTIONS key, or a function mapping the snapshot
+            to one score per coin. Ignored when weights is given.
+        k (int): Number of entries.
+        bottom (bool): Rank the lowest scores first instead of the highest.
+        weights (list): Custom 1h/24h/7d weights (see weighted_score).
+        min_rank (int): Only coins with market-cap rank >= min_rank.
+        max_rank (int): Only coins with market-cap rank <= max_rank.
+        exclude_stablecoins (bool): Drop coins listed in STABLECOIN_SYMBOLS.
+        exclude (list): Coin names to leave out.
+        include_ties (bool): Also return coins tied with the K-th entry. Ties are
+            otherwise broken by market-cap rank.
+
+    Returns:
+        list: One dict per entry (position, coin_name, symbol, rank, score), best first.
+    """
+    if k < 1:
+        raise ValueError("k must be at least 1.")
+
+    if weights is not None:
+        score_func = weighted_score(weights)
+        score_name = 'custom_weights'
+    elif callable(score):
+        score_func = score
+        score_name = getattr(score, '__name__', 'custom')
+    elif score in SCORE_FUNCTIONS:
+        score_func = SCORE_FUNCTIONS[score]
+        score_name = score
+    else:
+        raise ValueError(f"Unknown score '{score}'. Choose one of: {', '.join(SCORE_FUNCTIONS)}.")
+
+    scores = np.asarray(score_func(data), dtype=np.float64)
+    names = np.asarray(data['name'], dtype=object)
+    symbols = np.asarray(data['symbol'], dtype=object)
+    ranks = _numeric(data, 'rank')
+
+    # --- Filters ---
+    mask = np.ones(len(scores), dtype=bool)
+    if min_rank is not None:
+        mask &= ranks >= min_rank
+    if max_rank is not None:
+        mask &= ranks <= max_rank
+    if exclude_stablecoins:
+        mask &= ~np.isin(symbols, list(STABLECOIN_SYMBOLS))
+    if exclude:
+        mask &= ~np.isin(names, list(exclude))
+
+    selected = select_top_k(scores, k, bottom=bottom, ranks=ranks, mask=mask, include_ties=include_ties)
+
+    return [{
+        'position': position,
+        'coin_name': names[row],
+        'symbol': symbols[row],
+        'rank': int(ranks[row]) if np.isfinite(ranks[row]) else None,
+        'score_name': score_name,
+        'score': round(float(scores[row]), 6),
+    } for position, row in enumerate(selected, 1)]
+
+
+def top_k_ranking(data, score='weighted_growth', k=10, bottom=False, **filters):
+    """
+    Leaderboard in the (results_dict, output_msg) shape used by the analysis models.
+
+    Args:
+        data (pd.DataFrame | TickerTable): The cleaned snapshot.
+        score (str): A SCORE_FUNCTIONS key.
+        k (int): Number of entries.
+        bottom (bool): Rank the lowest scores first.
+        **filters: Any other rank_coins keyword (weights, max_rank, exclude_stablecoins...).
+
+    Returns:
+        tuple: The results dict and a printable leaderboard.
+    """
+    leaderboard = rank_coins(data, score=score, k=k, bottom=bottom, **filters)
+    metric = 'custom_weights' if filters.get('weights') is not None else score
+    direction = 'Bottom' if bottom else 'Top'
+
+    results_dict = {
+        'analysis_type': 'Top-K Ranking',
+        'metric': metric,
+        'direction': direction.lower(),
+        'k': k,
+        'filters': {key: value for key, value in filters.items() if value is not None and value is not False},
+        'leaderboard': leaderboard,
+    }
+
+    if not leaderboard:
+        return results_dict, f"No coins match the selected filters for {metric}."
+
+    lines = [f"--- {direction} {k} by {metric} ---"]
+    for entry in leaderboard:
+        lines.append(f" {entry['position']:>3}. {entry['coin_name']} ({entry['symbol']}) "
+                     f"rank {entry['rank']}: {entry['score']:.4f}")
+    return results_dict, "\n".join(lines)
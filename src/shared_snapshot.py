@@ -0,0 +1,241 @@
+import os
+import atexit
+import secrets
+from multiprocessing import shared_memory, resource_tracker
+import numpy as np
+
+from src.ticker_table import TickerTable, TEXT_COLUMNS
+
+# Every segment name starts with this prefix and the owner's pid, so segments
+# left behind by a crashed process can be found and removed later.
+SEGMENT_PREFIX = 'cma_snapshot'
+_SHM_DIR = '/dev/shm'
+_ALIGNMENT = 64
+
+
+def _layout(arrays):
+    """Computes the byte offset of every array inside one segment (64-byte aligned)."""
+    layout = {}
+    offset = 0
+    for key, array in arrays.items():
+        offset = -(-offset // _ALIGNMENT) * _ALIGNMENT
+        layout[key] = (offset, array.shape, array.dtype.str)
+        offset += array.nbytes
+    return layout, max(offset, 1)
+
+
+def _table_arrays(table, history):
+    """Flattens a TickerTable (and optional history arrays) into plain NumPy arrays."""
+    arrays = {'values': np.ascontiguousarray(table.values, dtype=np.float64)}
+    # Text goes in as fixed-width unicode so it can live in shared memory too
+    for col in TEXT_COLUMNS:
+        arrays[f"text:{col}"] = np.asarray(table.text[col], dtype=str)
+    arrays['ids'] = np.asarray(table.ids, dtype=str)
+    for name, values in table.features.items():
+        arrays[f"feature:{name}"] = np.ascontiguousarray(values, dtype=np.float64)
+
+    for key, array in (history or {}).items():
+        if isinstance(array, np.ndarray):
+            if array.dtype.kind == 'M':
+                array = array.astype('datetime64[s]')
+            arrays[f"history:{key}"] = np.ascontiguousarray(array)
+    return arrays
+
+
+class SharedSnapshot:
+    """
+    Owner of a snapshot published once into multiprocessing shared memory.
+
+    Workers receive only the small, picklable `descriptor` and attach to the same
+    pages as read-only NumPy views, so neither memory nor serialization cost grows
+    with the number of workers.
+
+    The segment is removed by close(), when used as a context manager, at interpreter
+    exit, and - if the owner is killed - by Python's resource tracker. Segments from
+    owners that are no longer running are swept by cleanup_stale_segments().
+    """
+
+    def __init__(self, table, history=None):
+        """
+        Args:
+            table (TickerTable): The snapshot to publish.
+            history (dict): Optional output of history.load_history to publish alongside.
+        """
+        arrays = _table_arrays(table, history)
+        layout, size = _layout(arrays)
+
+        name = f"{SEGMENT_PREFIX}_{os.getpid()}_{secrets.token_hex(4)}"
+        self._shm = shared_memory.SharedMemory(name=name, create=True, size=size)
+        for key, array in arrays.items():
+            offset, shape, dtype = layout[key]
+            np.ndarray(shape, dtype=dtype, buffer=self._shm.buf, offset=offset)[...] = array
+
+        self.descriptor = {
+            'name': self._shm.name,
+            'layout': layout,
+            'history_coins': list(history['coins']) if history else None,
+        }
+        self._closed = False
+        atexit.register(self.close)
+
+    @property
+    def name(self):
+        return self.descriptor['name']
+
+    @property
+    def nbytes(self):
+        return self._shm.size
+
+    def close(self):
+        """Releases and unlinks the segment. Safe to call more than once."""
+        if self._closed:
+            return
+        self._closed = True
+        atexit.unregister(self.close)
+        self._shm.close()
+        try:
+            self._shm.unlink()
+        except FileNotFoundError:
+            pass
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        self.close()
+
+
+class AttachedSnapshot:
+    """
+    A read-only view of a published snapshot inside a worker.
+
+    Attributes:
+        table (TickerTable): Backed by the shared pages (numeric, text and feature columns).
+        history (dict): The published history arrays, or None.
+    """
+
+    def __init__(self, descriptor):
+        self._shm = _attach_segment(descriptor['name'])
+        views = {}
+        for key, (offset, shape, dtype) in descriptor['layout'].items():
+            view = np.ndarray(tuple(shape), dtype=dtype, buffer=self._shm.buf, offset=offset)
+            view.flags.writeable = False
+            views[key] = view
+
+        text = {col: views[f"text:{col}"] for col in TEXT_COLUMNS}
+        features = {key.split(':', 1)[1]: view for key, view in views.items() if key.startswith('feature:')}
+        self.table = TickerTable(views['values'], text, views['ids'], features)
+
+        history = {key.split(':', 1)[1]: view for key, view in views.items() if key.startswith('history:')}
+        if history:
+            history['coins'] = descriptor['history_coins']
+        self.history = history or None
+
+    def close(self):
+        """Detaches from the segment (the owner is responsible for unlinking it)."""
+        self.table = self.history = None
+        self._shm.close()
+
+
+def _tracker_running():
+    """
+    Whether this process already talks to a resource tracker (e.g. one inherited
+    from the owner). Relies on CPython internals; if they are not available, it
+    reports False so the caller takes the safe path of unregistering.
+    """
+    tracker = getattr(resource_tracker, '_resource_tracker', None)
+    return getattr(tracker, '_fd', None) is not None
+
+
+def _attach_segment(name):
+    """Opens an existing segment without letting a private resource tracker unlink it."""
+    try:
+        # Python 3.13+: attach without registering with any resource tracker
+        return shared_memory.SharedMemory(name=name, create=False, track=False)
+    except TypeError:
+        pass
+
+    # Processes started by multiprocessing after the owner's tracker was running share
+    # that tracker, where re-registering is harmless. Any other process would start a
+    # tracker of its own that unlinks the segment when the process exits, so there the
+    # segment must be forgotten right after attaching.
+    shares_tracker = _tracker_running()
+    shm = shared_memory.SharedMemory(name=name, create=False)
+    if not shares_tracker:
+        # The tracker registers the name with its leading slash (shm._name)
+        resource_tracker.unregister(getattr(shm, '_name', '/' + shm.name), 'shared_memory')
+    return shm
+
+
+def start_tracker():
+    """
+    Starts the resource tracker in the owner process.
+
+    Call this before creating a worker pool: workers forked afterwards share the
+    tracker, which then also removes the segments if the whole process tree dies.
+    """
+    resource_tracker.ensure_running()
+
+
+# --- Worker helpers ---
+
+_attached = {}
+
+
+def attach(descriptor):
+    """
+    Returns the AttachedSnapshot for a descriptor, attaching on first use.
+
+    Workers keep only the most recent snapshot attached; older ones are closed
+    when a new descriptor arrives.
+    """
+    name = descriptor['name']
+    if name not in _attached:
+        for old in _attached.values():
+            old.close()
+        _attached.clear()
+        _attached[name] = AttachedSnapshot(descriptor)
+    return _attached[name]
+
+
+def attached_table(descriptor):
+    """Shortcut for attach(descriptor).table."""
+    return attach(descriptor).table
+
+
+def cleanup_stale_segments():
+    """
+    Removes segments left by owner processes that are no longer running (Linux only).
+
+    Returns:
+        list: Names of the removed segments.
+    """
+    removed = []
+    if not os.path.isdir(_SHM_DIR):
+        return removed
+
+    for entry in os.listdir(_SHM_DIR):
+        if not entry.startswith(SEGMENT_PREFIX + '_'):
+            continue
+        try:
+            pid = int(entry[len(SEGMENT_PREFIX) + 1:].split('_')[0])
+        except ValueError:
+            continue
+        if _pid_alive(pid):
+            continue
+        try:
+            os.unlink(os.path.join(_SHM_DIR, entry))
+            removed.append(entry)
+        except OSError:
+            pass
+    return removed
+
+
+def _pid_alive(pid):
+    try:
+        os.kill(pid, 0)
+    except ProcessLookupError:
+        return False
+    except PermissionError:
+        return True
+    return True
@@ -0,0 +1,184 @@
+import os
+import json
+import argparse
+import numpy as np
+
+import src.ranking as rk
+from src.data_ingestion import REPORTS_DIR, ensure_directory_exists
+from src.ticker_table import read_ticker_table
+from src.utils import REPORT_OUTPUT_DIR
+
+DEFAULT_TOP = 10
+
+
+def _coin_entry(table, row):
+    rank = table['rank'][row]
+    return {
+        'id': str(table.ids[row]),
+        'name': str(table['name'][row]),
+        'symbol': str(table['symbol'][row]),
+        'rank': int(rank) if np.isfinite(rank) else None,
+    }
+
+
+def _pct_change(new, old):
+    with np.errstate(divide='ignore', invalid='ignore'):
+        return 100 * (new / old - 1)
+
+
+def diff_snapshots(old, new, old_name=None, new_name=None, top=DEFAULT_TOP):
+    """
+    Compares two snapshots, aligning coins by id through a hash index.
+
+    Args:
+        old (TickerTable): The earlier snapshot.
+        new (TickerTable): The later snapshot.
+        old_name (str): Label of the earlier snapshot in the report.
+        new_name (str): Label of the later snapshot in the report.
+        top (int): Size of the movers and rank changes lists.
+
+    Returns:
+        dict: Structured, JSON-serializable diff report.
+    """
+    old_rows = new.align_to(old)
+    matched = old_rows >= 0
+
+    # --- Entrants and dropouts ---
+    entrants = [_coin_entry(new, row) for row in np.flatnonzero(~matched)]
+    still_listed = np.zeros(len(old), dtype=bool)
+    still_listed[old_rows[matched]] = True
+    dropouts = [_coin_entry(old, row) for row in np.flatnonzero(~still_listed)]
+
+    # --- Deltas, in the new snapshot's row order (NaN for entrants) ---
+    def aligned(column):
+        before = np.full(len(new), np.nan)
+        before[matched] = old[column][old_rows[matched]]
+        return before
+
+    old_price, old_cap, old_rank = aligned('price_usd'), aligned('market_cap_usd'), aligned('rank')
+    price_pct = _pct_change(new['price_usd'], old_price)
+    cap_delta = new['market_cap_usd'] - old_cap
+    # Positive means the coin moved up the ranking (e.g. 5 -> 3 is +2)
+    rank_change = old_rank - new['rank']
+
+    def price_entry(row):
+        return {**_coin_entry(new, row),
+                'old_price_usd': float(old_price[row]),
+                'new_price_usd': float(new['price_usd'][row]),
+                'price_change_pct': round(float(price_pct[row]), 4)}
+
+    def cap_entry(row):
+        return {**_coin_entry(new, row),
+                'market_cap_change_usd': round(float(cap_delta[row]), 2)}
+
+    def movers(scores, bottom):
+        # Partial selection over the aligned deltas; entrants (NaN) are skipped
+        return rk.select_top_k(scores, top, bottom=bottom, ranks=new['rank'])
+
+    moved = np.flatnonzero(np.nan_to_num(rank_change) != 0)
+    by_size = moved[np.argsort(-np.abs(rank_change[moved]), kind='stable')][:top]
+
+    total_cap_old = np.nansum(old['market_cap_usd'])
+    total_cap_new = np.nansum(new['market_cap_usd'])
+
+    return {
+        'analysis_type': 'Snapshot Diff',
+        'old_snapshot': old_name,
+        'new_snapshot': new_name,
+        'coins_old': len(old),
+        'coins_new': len(new),
+        'matched': int(matched.sum()),
+        'total_market_cap_change_usd': round(float(total_cap_new - total_cap_old), 2),
+        'total_market_cap_change_pct': round(float(_pct_change(total_cap_new, total_cap_old)), 4),
+        'entrants': entrants,
+        'dropouts': dropouts,
+        'top_price_gainers': [price_entry(row) for row in movers(price_pct, bottom=False)],
+        'top_price_losers': [price_entry(row) for row in movers(price_pct, bottom=True)],
+        'top_market_cap_gainers': [cap_entry(row) for row in movers(cap_delta, bottom=False)],
+        'top_market_cap_losers': [cap_entry(row) for row in movers(cap_delta, bottom=True)],
+        'rank_changes_count': int(len(moved)),
+        'largest_rank_changes': [{**_coin_entry(new, row),
+                                  'old_rank': int(old_rank[row]),
+                                  'change': int(rank_change[row])} for row in by_size],
+    }
+
+
+def diff_chain(filepaths, top=DEFAULT_TOP):
+    """
+    Diffs a sequence of snapshots pairwise (1->2, 2->3, ...), loading each file once.
+
+    Each table's id index is built once and reused while it is the "old" side of
+    the next step.
+
+    Args:
+        filepaths (list): Raw export paths, oldest first.
+        top (int): Size of the movers and rank changes lists.
+
+    Returns:
+        dict: One report per consecutive pair under 'steps', plus an 'overall'
+        first-vs-last diff when more than two snapshots are given.
+    """
+    if len(filepaths) < 2:
+        raise ValueError("At least two snapshots are needed for a diff.")
+
+    names = [os.path.basename(path) for path in filepaths]
+    first = previous = read_ticker_table(filepaths[0])
+    steps = []
+    for path, old_name, new_name in zip(filepaths[1:], names, names[1:]):
+        current = read_ticker_table(path)
+        steps.append(diff_snapshots(previous, current, old_name, new_name, top=top))
+        previous = current
+
+    report = {
+        'analysis_type': 'Snapshot Diff Chain',
+        'snapshots': names,
+        'steps': steps,
+    }
+    if len(filepaths) > 2:
+        report['overall'] = diff_snapshots(first, previous, names[0], names[-1], top=top)
+    return report
+
+
+def format_diff(diff):
+    """Builds a short console summary of a diff report."""
+    lines = [
+        f"--- Snapshot Diff: {diff['old_snapshot']} -> {diff['new_snapshot']} ---",
+        f"Coins: {diff['coins_old']} -> {diff['coins_new']} ({diff['matched']} in both)",
+        f"Total market cap change: {diff['total_market_cap_change_pct']:.2f}%",
+        f"New entrants: {', '.join(c['name'] for c in diff['entrants']) or 'none'}",
+        f"Dropouts: {', '.join(c['name'] for c in diff['dropouts']) or 'none'}",
+        "Top price gainers: " + (', '.join(f"{c['name']} ({c['price_change_pct']:+.2f}%)"
+                                           for c in diff['top_price_gainers']) or 'none'),
+        "Top price losers: " + (', '.join(f"{c['name']} ({c['price_change_pct']:+.2f}%)"
+                                          for c in diff['top_price_losers']) or 'none'),
+        f"Rank changes: {diff['rank_changes_count']}"
+        + ''.join(f"\n   {c['name']}: {c['old_rank']} -> {c['rank']}" for c in diff['largest_rank_changes']),
+    ]
+    return "\n".join(lines)
+
+
+def save_chain_report(report):
+    """Saves a diff chain report as JSON and returns its path."""
+    ensure_directory_exists(REPORT_OUTPUT_DIR)
+    first = report['snapshots'][0].replace('.txt', '').replace('consulta_', '')
+    last = report['snapshots'][-1].replace('.txt', '').replace('consulta_', '')
+    filepath = os.path.join(REPORT_OUTPUT_DIR, f"snapshot_diff_{first}_to_{last}.json")
+    with open(filepath, 'w') as f:
+        json.dump(report, f, indent=4)
+    return filepath
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Compare raw tickers exports (by coin id).")
+    parser.add_argument('snapshots', nargs='*',
+                        help="Two or more raw export file names, oldest first (default: every file).")
+    parser.add_argument('--top', type=int, default=DEFAULT_TOP, help="Size of the movers lists.")
+    args = parser.parse_args()
+
+    files = args.snapshots or sorted(f for f in os.listdir(REPORTS_DIR) if f.endswith('.txt'))
+    if len(files) < 2:
+        print("At least two Tickers files are needed for a diff.")
+    else:
+        chain = diff_chain([os.path.join(REPORTS_DIR, f) for f in files], top=args.top)
+        print(format_diff(chain.get('overall', chain['steps'][-1])))
+        print(f"\nDiff report saved to: {save_chain_report(chain)}")
@@ -0,0 +1,206 @@
+import os
+import csv
+import numpy as np
+import pandas as pd
+
+from src.data_ingestion import REPORTS_DIR, TICKERS_FIELDNAMES
+
+# Text columns of the raw export, kept as object arrays
+TEXT_COLUMNS = ['symbol', 'name', 'nameid']
+
+# Numeric columns of the raw export. The three change columns go first so the
+# models can read them as a single contiguous block (see TickerTable.changes).
+NUMERIC_COLUMNS = ['percent_change_1h', 'percent_change_24h', 'percent_change_7d',
+                   'id', 'rank', 'price_usd', 'price_btc', 'market_cap_usd',
+                   'volume24', 'volume24a', 'csupply', 'tsupply', 'msupply']
+
+CHANGE_COLUMNS = NUMERIC_COLUMNS[:3]
+
+
+class TickerTable:
+    """
+    Compact, array-backed representation of one tickers snapshot.
+
+    Numeric columns live in a single (n_columns, n_coins) float64 matrix, so every
+    column is a contiguous NumPy array. Coins can be looked up by name or id in O(1)
+    through dictionary indexes instead of boolean-mask filtering a DataFrame.
+
+    Columns are read with the same syntax as a DataFrame (table['price_usd']),
+    which lets the analysis models accept either representation. Derived features
+    materialized by src.feature_store can be attached and are read the same way.
+    """
+
+    __slots__ = ('values', 'text', 'ids', 'features', '_column_index', '_name_index', '_id_index')
+
+    def __init__(self, values, text, ids, features=None):
+        """
+        Args:
+            values (np.ndarray): Float matrix of shape (len(NUMERIC_COLUMNS), n_coins).
+            text (dict): Maps each TEXT_COLUMNS entry to an object array of length n_coins.
+            ids (list | np.ndarray): The raw coin ids (str), in row order.
+            features (dict): Optional derived feature columns (name -> float array).
+        """
+        self.values = values
+        self.text = text
+        self.ids = ids
+        self.features = features if features is not None else {}
+        self._column_index = {col: i for i, col in enumerate(NUMERIC_COLUMNS)}
+        # Lookup indexes are built on first use, so code that only reads whole
+        # columns never pays for them
+        self._name_index = None
+        self._id_index = None
+
+    @staticmethod
+    def _build_index(keys):
+        # The first occurrence wins on duplicates, matching what .iloc[0]
+        # would return on a filtered DataFrame.
+        index = {}
+        for row, key in enumerate(keys):
+            index.setdefault(str(key), row)
+        return index
+
+    def _names(self):
+        if self._name_index is None:
+            self._name_index = self._build_index(self.text['name'])
+        return self._name_index
+
+    def _ids(self):
+        if self._id_index is None:
+            self._id_index = self._build_index(self.ids)
+        return self._id_index
+
+    def __len__(self):
+        return len(self.ids)
+
+    def __getitem__(self, column):
+        """Returns a whole column as a NumPy array (a view for numeric columns)."""
+        if column in self._column_index:
+            return self.values[self._column_index[column]]
+        if column in self.text:
+            return self.text[column]
+        if column in self.features:
+            return self.features[column]
+        raise KeyError(column)
+
+    def __contains__(self, column):
+        return column in self._column_index or column in self.text or column in self.features
+
+    @property
+    def empty(self):
+        return len(self.ids) == 0
+
+    @property
+    def changes(self):
+        """The 1h, 24h and 7d change columns as a (3, n_coins) view."""
+        return self.values[:3]
+
+    def row_of(self, coin_name):
+        """Returns the row index of a coin by name, or None if it is not present."""
+        return self._names().get(coin_name)
+
+    def row_of_id(self, coin_id):
+        """Returns the row index of a coin by its API id, or None if it is not present."""
+        return self._ids().get(str(coin_id))
+
+    def coin_changes(self, coin_name):
+        """Returns the [1h, 24h, 7d] changes of a coin, or None if it is not present."""
+        row = self.row_of(coin_name)
+        if row is None:
+            return None
+        return self.values[:3, row]
+
+    def align_to(self, other):
+        """
+        Maps every coin of this table to its row in another snapshot, matching by id.
+
+        Uses other's hash index (built once per table), so aligning a sequence of
+        snapshots costs O(n) per step instead of a DataFrame merge.
+
+        Returns:
+            np.ndarray: Row indexes into other, -1 where the coin is not present there.
+        """
+        index = other._ids()
+        return np.fromiter((index.get(str(coin_id), -1) for coin_id in self.ids),
+                           dtype=np.int64, count=len(self.ids))
+
+    @classmethod
+    def from_dataframe(cls, df):
+        """Builds a TickerTable from a DataFrame returned by load_data_from_csv."""
+        values = np.empty((len(NUMERIC_COLUMNS), len(df)), dtype=np.float64)
+        for i, col in enumerate(NUMERIC_COLUMNS):
+            values[i] = pd.to_numeric(df[col], errors='coerce').to_numpy(dtype=np.float64)
+        text = {col: np.asarray(df[col].astype(str).tolist(), dtype=object) for col in TEXT_COLUMNS}
+        ids = [str(coin_id) for coin_id in df['id'].tolist()]
+        return cls(values, text, ids)
+
+
+def _to_float_column(cells):
+    """
+    Converts one raw CSV column to float64. Empty or malformed cells become NaN,
+    matching pd.to_numeric(errors='coerce').
+    """
+    try:
+        return np.array([cell or 'nan' for cell in cells], dtype=np.float64)
+    except ValueError:
+        # Slow path: at least one malformed cell, parse them one by one
+        column = np.empty(len(cells), dtype=np.float64)
+        for i, cell in enumerate(cells):
+            try:
+                column[i] = float(cell)
+            except ValueError:
+                column[i] = np.nan
+        return column
+
+
+def read_ticker_table(filepath):
+    """
+    Parses a raw tickers export straight into a TickerTable (no DataFrame involved).
+
+    Args:
+        filepath (str): Full path of the raw export.
+
+    Returns:
+        TickerTable: The parsed snapshot.
+    """
+    field_pos = {field: i for i, field in enumerate(TICKERS_FIELDNAMES)}
+
+    n_fields = len(TICKERS_FIELDNAMES)
+    with open(filepath, 'r', newline='') as csvfile:
+        reader = csv.reader(csvfile)
+        next(reader, None)  # Skip the header line, same as load_data_from_csv
+        # Pad short rows (and trim long ones) to the export layout, so missing
+        # cells become NaN as with pandas instead of truncating every column
+        rows = [row[:n_fields] + [''] * (n_fields - len(row)) for row in reader if row]
+
+    # Transpose once so every column is parsed in a single NumPy conversion
+    columns = list(zip(*rows)) if rows else [()] * len(TICKERS_FIELDNAMES)
+
+    values = np.empty((len(NUMERIC_COLUMNS), len(rows)), dtype=np.float64)
+    for i, col in enumerate(NUMERIC_COLUMNS):
+        values[i] = _to_float_column(columns[field_pos[col]])
+
+    text = {}
+    for col in TEXT_COLUMNS:
+        column = np.empty(len(rows), dtype=object)
+        column[:] = columns[field_pos[col]]
+        text[col] = column
+
+    return TickerTable(values, text, list(columns[field_pos['id']]))
+
+
+def load_ticker_table(filename):
+    """
+    Loads a raw export from the raw exports' directory into a TickerTable.
+
+    Args:
+        filename (str): The name of the raw file to load.
+
+    Returns:
+        TickerTable: The parsed snapshot.
+    """
+    filepath = os.path.join(REPORTS_DIR, filename)
+
+    if not os.path.exists(filepath):
+        raise FileNotFoundError(f"Error: File not found at {filepath}")
+
+    return read_ticker_table(filepath)
@@ -7,6 +7,8 @@ import pandas as pd
 import numpy as np
 from sklearn.linear_model import LinearRegression # Needed for plotting the line
 
+from src.ticker_table import TickerTable
+
 VISUALIZATIONS_DIR = 'reports/visualizations'
 
 def ensure_directory_exists(path):
@@ -14,79 +16,130 @@ def ensure_directory_exists(path):
         os.makedirs(path)
 
 
-def generate_bar_chart(df, change_column, time_label):
-    """
-    Generates a bar chart visualizing cryptocurrency percentage changes.
+# Axis labels of the derived features materialized at ingest (src.feature_store)
+FEATURE_LABELS = {
+    'weighted_change': "Weighted average change % (last week)",
+    'trend_slope': "Least Squares trend slope",
+    'volatility_std': "Volatility (std of 1h/24h/7d changes)",
+    'volume_to_market_cap': "24h volume / market cap",
+    'log_return_price': "Price log return since the previous snapshot",
+}
 
-    Args:
-        df (pd.DataFrame): The cleaned DataFrame.
-        change_column (str): The column name to plot (e.g., 'percent_change_7d').
-        time_label (str): The human-readable label for the time period (e.g., '7 days').
 
-    Returns:
-        str: The filepath of the saved image.
+def _chart_target(output, file_tag):
     """
+    Returns where a chart is saved: the given file-like output, or a new timestamped
+    PNG path in VISUALIZATIONS_DIR.
+    """
+    if output is not None:
+        return output
 
-    VISUALIZATIONS_DIR = 'reports/visualizations'
-    if not os.path.exists(VISUALIZATIONS_DIR):
-        os.makedirs(VISUALIZATIONS_DIR)
-
-    # Prepare data directly from the DataFrame
-    nombres = df['name']
-    cambios = df[change_column]
+    ensure_directory_exists(VISUALIZATIONS_DIR)
 
     # Generate the unique filename
     timestamp = datetime.now().strftime("%Y-%m-%d_%H-%M-%S")
-    filename = f"Graph_Changes_{change_column}_{timestamp}.png"
-    filepath = os.path.join(VISUALIZATIONS_DIR, filename)
+    filename = f"Graph_{file_tag}_{timestamp}.png"
+    return os.path.join(VISUALIZATIONS_DIR, filename)
+
+
+def _save_bar_chart(names, values, ylabel, title, file_tag, output=None):
+    """Draws one bar per coin and saves the figure, returning its target."""
+    filepath = _chart_target(output, file_tag)
 
     # --- Matplotlib Generation ---
     plt.figure(figsize=(10, 5))
-    plt.bar(nombres, cambios)
+    plt.bar(names, values)
 
     plt.xlabel('Coin')
-    plt.ylabel(f'Change % in {time_label}')
-    plt.title(f'Change % in {time_label} for Each Coin')
+    plt.ylabel(ylabel)
+    plt.title(title)
 
     plt.xticks(rotation=45, ha='right')
     plt.tight_layout()
 
-    plt.savefig(filepath)
+    plt.savefig(filepath, format='png')
     plt.close()  # Close the figure to free memory
 
     return filepath
 
 
-def generate_regression_plot(df):
+def generate_bar_chart(df, change_column, time_label, output=None):
+    """
+    Generates a bar chart visualizing cryptocurrency percentage changes.
+
+    Args:
+        df (pd.DataFrame | TickerTable): The cleaned snapshot.
+        change_column (str): The column name to plot (e.g., 'percent_change_7d').
+        time_label (str): The human-readable label for the time period (e.g., '7 days').
+        output (file-like): Optional target (e.g. io.BytesIO) to render the PNG into
+            instead of a new file in VISUALIZATIONS_DIR.
+
+    Returns:
+        str: The filepath of the saved image (or output, when given).
+    """
+    # Prepare data directly from the DataFrame
+    nombres = df['name']
+    cambios = df[change_column]
+
+    return _save_bar_chart(nombres, cambios,
+                           ylabel=f'Change % in {time_label}',
+                           title=f'Change % in {time_label} for Each Coin',
+                           file_tag=f"Changes_{change_column}", output=output)
+
+
+def generate_feature_bar_chart(df, feature, output=None):
+    """
+    Generates a bar chart of a derived feature, read from the columns materialized
+    at ingest instead of being recomputed.
+
+    Args:
+        df (pd.DataFrame | TickerTable): A snapshot loaded with its features attached.
+        feature (str): A FEATURE_LABELS key (e.g., 'weighted_change').
+        output (file-like): Optional target to render the PNG into (see generate_bar_chart).
+
+    Returns:
+        str: The filepath of the saved image (or output, when given), or None if the
+        feature is not available.
+    """
+    if feature not in df:
+        print(f"Error: Feature '{feature}' is not available for this snapshot.")
+        return None
+
+    label = FEATURE_LABELS.get(feature, feature)
+    return _save_bar_chart(df['name'], df[feature],
+                           ylabel=label,
+                           title=f'{label} for Each Coin',
+                           file_tag=f"Feature_{feature}", output=output)
+
+
+def generate_regression_plot(df, output=None):
     """
     Generates a scatter plot showing the relationship between 7-day change (X)
     and 24-hour change (Y), with the Linear Regression line superimposed.
-    """
-    ensure_directory_exists(VISUALIZATIONS_DIR)
 
+    If output (a file-like object) is given, the PNG is rendered into it instead of
+    a new file in VISUALIZATIONS_DIR.
+    """
     # 1. Defining Columns for Logistic Regression
     x_column = 'percent_change_7d'
     y_column = 'percent_change_24h'
 
     # 2. Fit the model to get the line parameters
-    X = df[x_column].values.reshape(-1, 1)
-    y = df[y_column].values
+    X = np.asarray(df[x_column], dtype=np.float64).reshape(-1, 1)
+    y = np.asarray(df[y_column], dtype=np.float64)
     model = LinearRegression()
     model.fit(X, y)
 
-    # Generate the unique filename
-    timestamp = datetime.now().strftime("%Y-%m-%d_%H-%M-%S")
-    filename = f"Graph_Regression_{x_column}_vs_{y_column}_{timestamp}.png"
-    filepath = os.path.join(VISUALIZATIONS_DIR, filename)
+    filepath = _chart_target(output, f"Regression_{x_column}_vs_{y_column}")
 
     # --- Matplotlib/Seaborn Generation ---
     plt.figure(figsize=(10, 6))
 
     # Plot the scatter points
-    sns.scatterplot(x=x_column, y=y_column, data=df, label='Data Points')
+    sns.scatterplot(x=X[:, 0], y=y, label='Data Points')
 
     # Plot the regression line
-    plt.plot(df[x_column], model.predict(X), color='red',
+    plt.plot(X[:, 0], model.predict(X), color='red',
              label=f'Regression Line (Slope: {model.coef_[0]:.2f})')
 
     plt.xlabel('7-Day Percentage Change (%)')
@@ -97,39 +150,37 @@ def generate_regression_plot(df):
     plt.grid(True, linestyle='--', alpha=0.6)
     plt.tight_layout()
 
-    plt.savefig(filepath)
+    plt.savefig(filepath, format='png')
     plt.close()
 
     return filepath
 
 
-def generate_trend_projection_plot(df, coin_name):
+def generate_trend_projection_plot(df, coin_name, output=None):
     """
     Generates a line plot showing the short-term trend projection
     using the three percentage change points (1h, 24h, 7d).
 
     Args:
-        df (pd.DataFrame): The cleaned DataFrame.
+        df (pd.DataFrame | TickerTable): The cleaned snapshot.
         coin_name (str): The specific coin to plot.
+        output (file-like): Optional target to render the PNG into (see generate_bar_chart).
 
-    Returns: The filepath of the saved image.
+    Returns: The filepath of the saved image (or output, when given).
     """
-    ensure_directory_exists(VISUALIZATIONS_DIR)
 
-    # 1. Extract the change data
-    coin_data = df[df['name'] == coin_name].iloc[0]
-
-    # Percentage change points (Y)
-    y_values = coin_data[['percent_change_1h', 'percent_change_24h', 'percent_change_7d']].values
+    # 1. Extract the change data: percentage change points (Y)
+    if isinstance(df, TickerTable):
+        y_values = df.coin_changes(coin_name)
+    else:
+        coin_data = df[df['name'] == coin_name].iloc[0]
+        y_values = coin_data[['percent_change_1h', 'percent_change_24h', 'percent_change_7d']].values
 
     # Simulated "time" points for visualization (X)
     # We use 1, 24, 168 hours (simulating a time series)
     x_hours = np.array([1, 24, 168])
 
-    # Generate the unique filename
-    timestamp = datetime.now().strftime("%Y-%m-%d_%H-%M-%S")
-    filename = f"Graph_Projection_{coin_name}_{timestamp}.png"
-    filepath = os.path.join(VISUALIZATIONS_DIR, filename)
+    filepath = _chart_target(output, f"Projection_{coin_name}")
 
     # --- Matplotlib Generation ---
     plt.figure(figsize=(10, 6))
@@ -169,7 +220,175 @@ def generate_trend_projection_plot(df, coin_name):
     plt.grid(True, linestyle='--', alpha=0.6)
     plt.tight_layout()
 
-    plt.savefig(filepath)
+    plt.savefig(filepath, format='png')
+    plt.close()
+
+    return filepath
+
+
+# --- Long-history charts ---
+
+def minmax_downsample(x, y, n_buckets):
+    """
+    Downsamples series by keeping the min and max of each bucket (2 points per bucket).
+
+    Cheaper than LTTB and keeps every spike, at the cost of twice as many points.
+
+    Args:
+        x (np.ndarray): Shared x values, shape (n_points,), increasing.
+        y (np.ndarray): Series values, shape (n_series, n_points).
+        n_buckets (int): Number of buckets (usually half the pixel width).
+
+    Returns:
+        tuple: (x, y) arrays of shape (n_series, n_out).
+    """
+    y = np.atleast_2d(y)
+    n_points = y.shape[1]
+    if n_points <= 2 * n_buckets:
+        return np.broadcast_to(x, y.shape).copy(), y.copy()
+
+    edges = np.linspace(0, n_points, n_buckets + 1).astype(np.int64)
+    # Min/max value of every bucket, ignoring NaN
+    starts = edges[:-1]
+    filled = np.where(np.isnan(y), np.inf, y)
+    min_val = np.minimum.reduceat(filled, starts, axis=1)
+    max_val = np.maximum.reduceat(np.where(np.isnan(y), -np.inf, y), starts, axis=1)
+
+    # First index reaching the bucket min/max (order kept so lines follow time)
+    bucket = np.repeat(np.arange(n_buckets), np.diff(edges))
+    positions = np.arange(n_points)
+    is_min = filled == min_val[:, bucket]
+    is_max = y == max_val[:, bucket]
+    first_min = np.minimum.reduceat(np.where(is_min, positions, n_points), starts, axis=1)
+    first_max = np.minimum.reduceat(np.where(is_max, positions, n_points), starts, axis=1)
+
+    # Empty (all-NaN) buckets fall back to their first point
+    first_min = np.where(first_min == n_points, starts, first_min)
+    first_max = np.where(first_max == n_points, starts, first_max)
+
+    idx = np.sort(np.concatenate([first_min, first_max], axis=1), axis=1)
+    return x[idx], np.take_along_axis(y, idx, axis=1)
+
+
+def lttb_downsample(x, y, n_out):
+    """
+    Downsamples series with Largest-Triangle-Three-Buckets.
+
+    LTTB keeps the visual shape of a line with one point per bucket: in each bucket
+    it picks the point forming the largest triangle with the previously kept point
+    and the average of the next bucket. Buckets are walked in order, but each step
+    is vectorized over the bucket and over all series at once.
+
+    Args:
+        x (np.ndarray): Shared x values, shape (n_points,), increasing.
+        y (np.ndarray): Series values, shape (n_series, n_points). NaN gaps are kept.
+        n_out (int): Points per series after downsampling (usually the pixel width).
+
+    Returns:
+        tuple: (x, y) arrays of shape (n_series, n_out).
+    """
+    y = np.atleast_2d(np.asarray(y, dtype=np.float64))
+    x = np.asarray(x, dtype=np.float64)
+    n_series, n_points = y.shape
+    if n_out >= n_points or n_out < 3:
+        return np.broadcast_to(x, y.shape).copy(), y.copy()
+
+    # Bucket edges for the points between the fixed first and last ones
+    edges = np.linspace(1, n_points - 1, n_out - 1).astype(np.int64)
+    counts = np.diff(edges)
+    # The last point is excluded so the final bucket stops at edges[-1]
+    avg_x = np.add.reduceat(x[:-1], edges[:-1]) / counts
+    # Average only the finite values, so snapshots where a coin is missing (NaN)
+    # do not pull the bucket average towards 0; all-NaN buckets average to NaN
+    finite = np.isfinite(y[:, :-1])
+    sums = np.add.reduceat(np.where(finite, y[:, :-1], 0.0), edges[:-1], axis=1)
+    finite_counts = np.add.reduceat(finite, edges[:-1], axis=1)
+    with np.errstate(divide='ignore', invalid='ignore'):
+        avg_y = sums / finite_counts
+
+    idx = np.empty((n_series, n_out), dtype=np.int64)
+    idx[:, 0] = 0
+    idx[:, -1] = n_points - 1
+    rows = np.arange(n_series)
+
+    for b in range(n_out - 2):
+        start, end = edges[b], edges[b + 1]
+        if b + 1 < n_out - 2:
+            next_x, next_y = avg_x[b + 1], avg_y[:, b + 1]
+        else:
+            next_x, next_y = x[-1], y[:, -1]
+
+        prev = idx[:, b]
+        a_x = x[prev][:, None]
+        a_y = y[rows, prev][:, None]
+        # With no data in the next bucket, rank points by their distance to the
+        # previously kept one instead
+        next_y = np.where(np.isnan(next_y), a_y[:, 0], next_y)
+        area = np.abs((a_x - next_x) * (y[:, start:end] - a_y)
+                      - (a_x - x[start:end]) * (next_y[:, None] - a_y))
+        idx[:, b + 1] = start + np.argmax(np.nan_to_num(area, nan=-1.0), axis=1)
+
+    return x[idx], np.take_along_axis(y, idx, axis=1)
+
+
+def generate_history_plot(history, column='price_usd', coin_names=None, method='lttb',
+                          normalize=None, figsize=(12, 6), dpi=100, output=None):
+    """
+    Plots long price/volume histories for one or many coins, downsampled to the pixel width.
+
+    Args:
+        history (dict): Output of history.load_history.
+        column (str): The column to plot (must be in the history).
+        coin_names (list): Coins to overlay (defaults to every coin in the history).
+        method (str): 'lttb' or 'minmax'.
+        normalize (bool): Plot % change vs. the first valid value, so coins with very
+            different prices share an axis. Defaults to True for more than one coin.
+        figsize (tuple): Figure size in inches.
+        dpi (int): Figure resolution; figsize[0] * dpi is the target point count.
+        output (file-like): Optional target to render the PNG into (see generate_bar_chart).
+
+    Returns:
+        str: The filepath of the saved image (or output, when given).
+    """
+    coin_names = coin_names or history['coins']
+    rows = [history['coins'].index(name) for name in coin_names]
+    y = history[column][rows]
+    times = history['time']
+    if normalize is None:
+        normalize = len(coin_names) > 1
+
+    if normalize:
+        first_valid = np.argmax(~np.isnan(y), axis=1)
+        base = y[np.arange(len(rows)), first_valid][:, None]
+        with np.errstate(divide='ignore', invalid='ignore'):
+            y = 100 * (y / base - 1)
+
+    # Downsample on float seconds; one output point per horizontal pixel
+    width_px = int(figsize[0] * dpi)
+    x = times.astype('datetime64[s]').astype(np.float64)
+    if method == 'minmax':
+        x_ds, y_ds = minmax_downsample(x, y, max(1, width_px // 2))
+    else:
+        x_ds, y_ds = lttb_downsample(x, y, width_px)
+
+    label = coin_names[0] if len(coin_names) == 1 else f"{len(coin_names)}_coins"
+    filepath = _chart_target(output, f"History_{column}_{label}")
+
+    # --- Matplotlib Generation ---
+    plt.figure(figsize=figsize, dpi=dpi)
+
+    for name, xs, ys in zip(coin_names, x_ds, y_ds):
+        plt.plot(xs.astype('datetime64[s]'), ys, linewidth=1, label=name)
+
+    plt.xlabel('Time')
+    plt.ylabel(f'Change in {column} (%)' if normalize else column)
+    plt.title(f'{column} History ({len(times)} snapshots, {method} downsampled)')
+
+    plt.legend()
+    plt.grid(True, linestyle='--', alpha=0.6)
+    plt.tight_layout()
+
+    plt.savefig(filepath, format='png', dpi=dpi)
     plt.close()
 
     return filepath